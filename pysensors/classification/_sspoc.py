@@ -26,9 +26,10 @@ from sklearn.utils.validation import check_is_fitted
 
 from ..basis import Identity
 from ..utils import (
+    as_dtype,
     constrained_binary_solve,
     constrained_multiclass_solve,
-    validate_input,
+    fit_basis,
 )
 
 INT_DTYPES = (int, np.int64, np.int32, np.int16, np.int8)
@@ -86,7 +87,8 @@ class SSPOC(BaseEstimator):
             (default Linear Discriminant Analysis (LDA))
         Classifier for which to optimize sensors. Must be a *linear* classifier
         with a :code:`coef_` attribute and :code:`fit` and :code:`predict`
-        methods.
+        methods. If None, a Linear Discriminant Analysis classifier using
+        :code:`lda_solver` is created when :meth:`fit` is called.
 
     n_sensors: positive integer, optional (default None)
         Number of sensor locations to be used after fitting.
@@ -113,6 +115,26 @@ class SSPOC(BaseEstimator):
         Larger values will result in a sparser s and fewer selected sensors.
         This parameter is ignored for binary classification problems.
 
+    lda_solver: {'svd', 'lsqr', 'eigen'}, optional (default 'svd')
+        Solver used by the default Linear Discriminant Analysis classifier.
+        Ignored if :code:`classifier` is passed.
+        Since the classifier is fit to data with only :code:`n_basis_modes`
+        features, the :code:`'lsqr'` and :code:`'eigen'` solvers, which work
+        with the (small) class covariance matrices rather than taking an SVD
+        of the data, can be considerably cheaper. With :code:`'eigen'` the
+        classifier solves the generalized eigenproblem
+        :math:`S_b v = \lambda S_w v` for the between- and within-class
+        scatter matrices of the projected data, which are only
+        :code:`n_basis_modes` by :code:`n_basis_modes`.
+        Both solvers require the within-class covariance matrix to be
+        nonsingular, so the :code:`'svd'` solver is kept as the default.
+
+    dtype: numpy dtype, optional (default None)
+        Floating point type the data and the inverse basis matrix are cast to,
+        e.g. :code:`np.float32` to halve the memory traffic of projecting the
+        data onto the basis. The classifier and the sensor selection may still
+        compute in double precision. If None, the data are used as given.
+
     Attributes
     ----------
     n_basis_modes: nonnegative integer
@@ -127,6 +149,16 @@ class SSPOC(BaseEstimator):
     sparse_sensors_: np.ndarray, shape (n_sensors, )
         The selected sensors.
 
+    classifier_: classifier object
+        The fitted classifier: :code:`classifier` if one was passed, otherwise
+        a Linear Discriminant Analysis classifier using :code:`lda_solver`.
+
+    classes_: np.ndarray, shape (n_classes, )
+        The distinct class labels seen during :meth:`fit`.
+
+    n_classes_: int
+        The number of distinct classes seen during :meth:`fit`.
+
     Examples
     --------
     >>> from sklearn.metrics import accuracy_score
@@ -137,8 +169,7 @@ class SSPOC(BaseEstimator):
     >>>
     >>> model = SSPOC(n_sensors=10, l1_penalty=0.03)
     >>> model.fit(x, y, quiet=True)
-    SSPOC(basis=Identity(n_basis_modes=100),
-          classifier=LinearDiscriminantAnalysis(), l1_penalty=0.03, n_sensors=10)
+    SSPOC(basis=Identity(n_basis_modes=100), l1_penalty=0.03, n_sensors=10)
     >>> print(model.selected_sensors)
     [10 13  6 19 17 16 15 14 12 11]
     >>>
@@ -162,18 +193,23 @@ class SSPOC(BaseEstimator):
         n_sensors=None,
         threshold=None,
         l1_penalty=0.1,
+        lda_solver="svd",
+        dtype=None,
     ):
         if basis is None:
             basis = Identity()
         self.basis = basis
-        if classifier is None:
-            classifier = LinearDiscriminantAnalysis()
         self.classifier = classifier
         self.n_sensors = n_sensors
         self.threshold = threshold
         self.l1_penalty = l1_penalty
+        self.lda_solver = lda_solver
+        self.dtype = dtype
         self.n_basis_modes = None
         self.refit_ = False
+        self._identity_basis = False
+        self._projector = None
+        self._abs_buf = None
 
     def fit(
         self,
@@ -215,37 +251,44 @@ class SSPOC(BaseEstimator):
         -------
         self: a fitted :class:`SSPOC` instance
         """
+        x = as_dtype(x, self.dtype)
 
         # Fit basis functions to data
-        if prefit_basis:
-            check_is_fitted(self.basis, "basis_matrix_")
-        else:
-            x = validate_input(x)
-
-            if quiet:
-                with warnings.catch_warnings():
-                    warnings.filterwarnings("ignore", category=UserWarning)
-                    self.basis.fit(x)
-            else:
-                self.basis.fit(x)
+        x = fit_basis(self.basis, x, prefit_basis=prefit_basis, quiet=quiet)
 
         # Get matrix representation of basis - this is \Psi^T in the paper
-        self.basis_matrix_inverse_ = self.basis.matrix_inverse(
-            n_basis_modes=self.n_basis_modes
+        self.basis_matrix_inverse_ = as_dtype(
+            self.basis.matrix_inverse(n_basis_modes=self.n_basis_modes), self.dtype
         )
+        # The identity basis leaves the data unchanged, so we can skip
+        # multiplying by an (n_features, n_features) identity matrix
+        self._identity_basis = isinstance(self.basis, Identity)
+        self._projector = None
+
+        # Built here rather than in __init__ so that set_params and clone
+        # pick up changes to lda_solver
+        if self.classifier is None:
+            self.classifier_ = LinearDiscriminantAnalysis(solver=self.lda_solver)
+        else:
+            self.classifier_ = self.classifier
 
         # Find weight vector
+        x_proj = self._project(x)
         if quiet:
             with warnings.catch_warnings():
                 warnings.filterwarnings("ignore", category=UserWarning)
                 warnings.filterwarnings("ignore", category=ConvergenceWarning)
-                self.classifier.fit(np.matmul(x, self.basis_matrix_inverse_.T), y)
+                self.classifier_.fit(x_proj, y)
         else:
-            self.classifier.fit(np.matmul(x, self.basis_matrix_inverse_.T), y)
+            self.classifier_.fit(x_proj, y)
 
-        w = np.squeeze(self.classifier.coef_).T
+        w = np.squeeze(self.classifier_.coef_).T
 
-        n_classes = len(set(y[:]))
+        # Fitted sklearn classifiers already know the classes
+        classes = getattr(self.classifier_, "classes_", None)
+        self.classes_ = np.unique(y) if classes is None else np.asarray(classes)
+        self.n_classes_ = len(self.classes_)
+        n_classes = self.n_classes_
         if n_classes == 2:
             s = constrained_binary_solve(
                 w, self.basis_matrix_inverse_, quiet=quiet, **optimizer_kws
@@ -285,7 +328,7 @@ class SSPOC(BaseEstimator):
         """
         Predict classes for given measurements.
         If :code:`self.n_sensors` is 0 then a dummy classifier is used in place
-        of :code:`self.classifier`.
+        of :code:`self.classifier_`.
 
         Parameters
         ----------
@@ -307,9 +350,44 @@ class SSPOC(BaseEstimator):
             )
             return self.dummy_.predict(x[:, 0])
         if self.refit_:
-            return self.classifier.predict(x)
+            return self._get_classifier().predict(as_dtype(x, self.dtype))
         else:
-            return self.classifier.predict(np.dot(x, self.basis_matrix_inverse_.T))
+            return self._get_classifier().predict(self._project(x))
+
+    def _get_classifier(self):
+        """
+        Get the classifier fit by :meth:`fit`, falling back on ``classifier``
+        if it has not been fit yet.
+        """
+        classifier = getattr(self, "classifier_", None)
+        return self.classifier if classifier is None else classifier
+
+    def _project(self, x):
+        """Map measurements to coordinates with respect to the basis."""
+        x = as_dtype(x, self.dtype)
+        if self._identity_basis:
+            return x
+        # Keep a contiguous copy of the transposed inverse so repeated calls
+        # to predict hand BLAS a contiguous operand without re-transposing
+        cached = self._projector
+        if cached is None or cached[0] is not self.basis_matrix_inverse_:
+            cached = (
+                self.basis_matrix_inverse_,
+                np.ascontiguousarray(self.basis_matrix_inverse_.T),
+            )
+            self._projector = cached
+        return np.matmul(x, cached[1])
+
+    def _sensor_magnitudes(self):
+        """
+        Absolute values of a one-dimensional sensor_coef_, written into a buffer
+        that is reused across calls to update_sensors.
+        """
+        buf = self._abs_buf
+        if buf is None or buf.shape != self.sensor_coef_.shape:
+            buf = np.empty(self.sensor_coef_.shape)
+            self._abs_buf = buf
+        return np.abs(self.sensor_coef_, out=buf)
 
     def update_sensors(
         self,
@@ -382,11 +460,9 @@ class SSPOC(BaseEstimator):
             # Could be made more efficient with a max heap
             # (we don't need to sort the whole list)
             if np.ndim(self.sensor_coef_) == 1:
-                sorted_sensors = np.argsort(-np.abs(self.sensor_coef_))
-                if (
-                    np.abs(self.sensor_coef_[sorted_sensors[n_sensors - 1]]) == 0
-                    and warn
-                ):
+                magnitudes = self._sensor_magnitudes()
+                sorted_sensors = np.argsort(-magnitudes)
+                if magnitudes[sorted_sensors[n_sensors - 1]] == 0 and warn:
                     warnings.warn(
                         "Some uninformative sensors were selected. "
                         "Consider decreasing n_sensors"
@@ -412,11 +488,10 @@ class SSPOC(BaseEstimator):
         else:
             self.threshold = threshold
             if np.ndim(self.sensor_coef_) == 1:
-                sparse_sensors = np.nonzero(np.abs(self.sensor_coef_) >= threshold)[0]
+                magnitudes = self._sensor_magnitudes()
             else:
-                sparse_sensors = np.nonzero(
-                    method(np.abs(self.sensor_coef_), axis=1, **method_kws) >= threshold
-                )[0]
+                magnitudes = method(np.abs(self.sensor_coef_), axis=1, **method_kws)
+            sparse_sensors = np.flatnonzero(magnitudes >= threshold)
 
             self.n_sensors = len(sparse_sensors)
             self.sparse_sensors_ = sparse_sensors
@@ -436,9 +511,9 @@ class SSPOC(BaseEstimator):
                     with warnings.catch_warnings():
                         warnings.filterwarnings("ignore", category=UserWarning)
                         warnings.filterwarnings("ignore", category=ConvergenceWarning)
-                        self.classifier.fit(x[:, self.sparse_sensors_], y)
+                        self._get_classifier().fit(x[:, self.sparse_sensors_], y)
                 else:
-                    self.classifier.fit(x[:, self.sparse_sensors_], y)
+                    self._get_classifier().fit(x[:, self.sparse_sensors_], y)
                 self.refit_ = True
             else:
                 warnings.warn("No selected sensors; model was not refit.")
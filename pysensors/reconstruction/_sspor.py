@@ -1,16 +1,66 @@
 import warnings
+from collections import OrderedDict
+from contextlib import nullcontext
+from functools import lru_cache
+from itertools import islice
 
 import numpy as np
-from scipy.linalg import lstsq, solve
+from scipy.linalg import (
+    cho_factor,
+    cho_solve,
+    get_blas_funcs,
+    lstsq,
+    qr,
+    solve,
+    solve_triangular,
+)
 from sklearn.base import BaseEstimator
 from sklearn.utils.validation import check_is_fitted
 
+try:
+    from threadpoolctl import ThreadpoolController
+except ImportError:  # threadpoolctl < 3.0; scikit-learn only requires >= 2.0
+    ThreadpoolController = None
+
 from ..basis import Identity
 from ..optimizers import CCQR, QR, TPGR
-from ..utils import validate_input
+from ..utils import as_dtype, fit_basis, validate_input
 
 INT_DTYPES = (int, np.int64, np.int32, np.int16, np.int8)
 
+# Number of sensor sets whose factorizations SSPOR keeps around
+FACTORIZATION_CACHE_SIZE = 8
+# Number of features reconstructed at a time when reducing over a full
+# reconstruction, e.g. when scoring
+RESIDUAL_CHUNK_SIZE = 4096
+# Number of coefficient entries lifted together when reconstruction_error
+# scores several numbers of sensors at once
+COEFFICIENT_STACK_SIZE = 2**20
+# Number of examples projected onto the basis at a time when fitting
+PROJECTION_CHUNK_SIZE = 4096
+# Linear systems smaller than this are solved with a single BLAS thread
+SMALL_SYSTEM_SIZE = 256
+
+
+@lru_cache(maxsize=None)
+def _threadpool_controller():
+    # Inspecting the loaded BLAS libraries is slow, so do it only once
+    return ThreadpoolController()
+
+
+def _limit_blas_threads(size):
+    """
+    Get a context manager limiting BLAS to one thread if ``size``, the largest
+    dimension of a linear system, is below ``SMALL_SYSTEM_SIZE``.
+
+    For small systems the cost of waking up a pool of BLAS threads exceeds the
+    cost of the solve itself. Large products, such as lifting coefficients
+    back to the full state, should be computed outside the returned context.
+    """
+    if size >= SMALL_SYSTEM_SIZE or ThreadpoolController is None:
+        return nullcontext()
+    return _threadpool_controller().limit(limits=1, user_api="blas")
+
 
 class SSPOR(BaseEstimator):
     """
@@ -46,6 +96,12 @@ class SSPOR(BaseEstimator):
         is equivalent to
         ``s = SSPOR(); s.fit(x); s.set_number_of_sensors(10)``.
 
+    dtype: numpy dtype, optional (default None)
+        Floating point type used for the data, the basis and all downstream
+        computations, e.g. ``np.float32`` to halve memory traffic and speed up
+        the matrix products and solves when single precision is accurate
+        enough. If None, the dtype of the input data is used.
+
     Attributes
     ----------
     n_basis_modes: int
@@ -84,7 +140,7 @@ class SSPOR(BaseEstimator):
     0.022405698005838044
     """
 
-    def __init__(self, basis=None, optimizer=None, n_sensors=None):
+    def __init__(self, basis=None, optimizer=None, n_sensors=None, dtype=None):
         if basis is None:
             basis = Identity()
         self.basis = basis
@@ -97,7 +153,11 @@ class SSPOR(BaseEstimator):
             self.n_sensors = int(n_sensors)
         else:
             raise ValueError("n_sensors must be a positive integer.")
+        self.dtype = dtype
         self.n_basis_modes = None
+        self._factorizations = None
+        self._basis_selection = None
+        self._orthonormal_basis = None
 
     def fit(self, x, quiet=False, prefit_basis=False, seed=None, **optimizer_kws):
         """
@@ -132,30 +192,39 @@ class SSPOR(BaseEstimator):
         self: a fitted :class:`SSPOR` instance
         """
 
-        # Fit basis functions to data
-        if prefit_basis:
-            check_is_fitted(self.basis, "basis_matrix_")
-        else:
-            x = validate_input(x)
-
-            if quiet:
-                with warnings.catch_warnings():
-                    warnings.filterwarnings("ignore", category=UserWarning)
-                    self.basis.fit(x)
-            else:
-                self.basis.fit(x)
+        x = as_dtype(x, self.dtype)
 
-        # Get matrix representation of basis
-        self.basis_matrix_ = self.basis.matrix_representation(
-            n_basis_modes=self.n_basis_modes
+        # Fit basis functions to data
+        x = fit_basis(self.basis, x, prefit_basis=prefit_basis, quiet=quiet)
+
+        # Get matrix representation of basis, stored in Fortran order so that
+        # its transpose (used when forming predictions) is C-contiguous
+        self.basis_matrix_ = np.asfortranarray(
+            as_dtype(
+                self.basis.matrix_representation(n_basis_modes=self.n_basis_modes),
+                self.dtype,
+            )
         )
+        self._factorizations = None
+        self._basis_selection = None
+        self._orthonormal_basis = None
 
         # Check that n_sensors doesn't exceed dimension of basis vectors and
         # that it doesn't exceed the number of samples when using the CCQR optimizer.
         self._validate_n_sensors()
         # Calculate the normalized singular values
-        X_proj = x @ self.basis_matrix_
-        self.singular_values = np.linalg.norm(X_proj, axis=0) / np.sqrt(x.shape[0])
+        # Project PROJECTION_CHUNK_SIZE examples at a time so the full
+        # (n_examples, n_basis_modes) projection is never held in memory.
+        # einsum fuses the square and the column sum of each chunk.
+        x_array = np.asarray(x)
+        sq_norms = np.zeros(
+            self.basis_matrix_.shape[1],
+            dtype=np.result_type(x_array, self.basis_matrix_),
+        )
+        for start in range(0, x_array.shape[0], PROJECTION_CHUNK_SIZE):
+            X_proj = x_array[start : start + PROJECTION_CHUNK_SIZE] @ self.basis_matrix_
+            sq_norms += np.einsum("ij,ij->j", X_proj, X_proj)
+        self.singular_values = np.sqrt(sq_norms) / x.shape[0] ** 0.5
         # Find sparse sensor locations
         if isinstance(self.optimizer, TPGR):
             self.ranked_sensors_ = self.optimizer.fit(
@@ -169,13 +238,27 @@ class SSPOR(BaseEstimator):
         # Randomly shuffle sensors after self.basis.n_basis_modes
         rng = np.random.default_rng(seed)
         n_basis_modes = self.basis_matrix_.shape[1]
-        self.ranked_sensors_[n_basis_modes:] = rng.permutation(
-            self.ranked_sensors_[n_basis_modes:]
-        )
+        if isinstance(self.ranked_sensors_, np.ndarray):
+            # Shuffle the view in place rather than allocating a permuted copy;
+            # this consumes the generator exactly as rng.permutation would
+            rng.shuffle(self.ranked_sensors_[n_basis_modes:])
+        else:
+            self.ranked_sensors_[n_basis_modes:] = rng.permutation(
+                self.ranked_sensors_[n_basis_modes:]
+            )
 
         return self
 
-    def predict(self, x, method=None, prior="decreasing", noise=None, **solve_kws):
+    def predict(
+        self,
+        x,
+        method=None,
+        prior="decreasing",
+        noise=None,
+        out=None,
+        validate=True,
+        **solve_kws,
+    ):
         """
         Predict values at all positions given measurements at sensor locations.
 
@@ -201,6 +284,15 @@ class SSPOR(BaseEstimator):
             Magnitude of the gaussian uncorrelated sensor measurement noise.
             If None, noise will default to the average of the computed prior.
 
+        out: numpy array, shape (n_samples, n_features), optional (default None)
+            Array in which to place the prediction. Reusing the same array
+            across calls avoids allocating a new output for every prediction.
+
+        validate: boolean, optional (default True)
+            Whether to check that ``x`` is a numpy array with one column per
+            selected sensor. Pass False to skip the check for inputs that are
+            already known to be valid, e.g. in tight prediction loops.
+
         solve_kws: dict, optional
             keyword arguments to be passed to the linear solver used to invert
             the basis matrix.
@@ -208,16 +300,34 @@ class SSPOR(BaseEstimator):
         Returns
         -------
         y: numpy array, shape (n_samples, n_features)
-            Predicted values at every location.
+            Predicted values at every location. If ``out`` was given, ``y`` is
+            ``out``.
         """
         check_is_fitted(self, "ranked_sensors_")
-        x = validate_input(x, self.ranked_sensors_[: self.n_sensors]).T
+        sensors = self.ranked_sensors_[: self.n_sensors]
+        if validate:
+            x = validate_input(x, sensors)
+        return self._predict(
+            x, sensors, method=method, prior=prior, noise=noise, out=out, **solve_kws
+        )
 
-        # For efficiency we may want to factor
-        # self.basis_matrix_[self.ranked_sensors_, :]
-        # in case predict is called multiple times.
-        # Although if the user changes the number of sensors between calls
-        # the factorization will be wasted.
+    def _predict(
+        self,
+        x,
+        sensors,
+        method=None,
+        prior="decreasing",
+        noise=None,
+        out=None,
+        **solve_kws,
+    ):
+        """
+        Implementation of :meth:`predict` for a fitted model and measurements
+        ``x`` already validated against ``sensors``, the selected sensors.
+        """
+        # LAPACK takes right-hand sides in Fortran order; for C-ordered
+        # measurements the transpose already is, so this rarely copies
+        x = np.asfortranarray(as_dtype(np.asarray(x).T, self.dtype))
 
         if self.n_sensors > self.basis_matrix_.shape[0] and method == "unregularized":
             warnings.warn(
@@ -227,44 +337,100 @@ class SSPOR(BaseEstimator):
             )
 
         if method is None:
-            if isinstance(prior, str) and prior == "decreasing":
-                computed_prior = self.singular_values
-            elif isinstance(prior, np.ndarray):
-                if prior.ndim != 1:
-                    raise ValueError("prior must be a 1D array")
-                if prior.shape[0] != self.basis_matrix_.shape[1]:
-                    raise ValueError(
-                        f"prior must be of shape {(self.basis_matrix_.shape[1],)},"
-                        f" but got {prior.shape}"
-                    )
-                computed_prior = prior
-            else:
-                raise ValueError(
-                    "Invalid prior: must be 'decreasing' or a 1D "
-                    "ndarray of appropriate length."
-                )
-            if noise is None:
-                warnings.warn(
-                    "noise is None. noise will be set to the "
-                    "average of the computed prior"
-                )
-                noise = computed_prior.mean()
-            return self._regularized_reconstruction(x, computed_prior, noise)
+            computed_prior, noise = self._resolve_prior_and_noise(prior, noise)
+            return self._regularized_reconstruction(
+                x, computed_prior, noise, out=out, sensors=sensors
+            )
         elif method == "unregularized":
             # Square matrix
             if self.n_sensors == self.basis_matrix_.shape[1]:
-                return self._square_predict(
-                    x, self.ranked_sensors_[: self.n_sensors], **solve_kws
-                )
+                return self._square_predict(x, sensors, out=out, **solve_kws)
             # Rectangular matrix
             else:
-                return self._rectangular_predict(
-                    x, self.ranked_sensors_[: self.n_sensors], **solve_kws
-                )
+                return self._rectangular_predict(x, sensors, out=out, **solve_kws)
         else:
             raise NotImplementedError("Method not implemented")
 
-    def _regularized_reconstruction(self, x, prior, noise):
+    def predict_batch(
+        self, xs, method=None, prior="decreasing", noise=None, **solve_kws
+    ):
+        """
+        Predict values at all positions for several sets of measurements.
+
+        The measurements are stacked and reconstructed with a single call to
+        :meth:`predict`, so the linear system is factored once and solved for
+        all right-hand sides together.
+
+        Parameters
+        ----------
+        xs: list of numpy arrays, each of shape (n_samples_i, n_sensors) or \
+                (n_sensors,)
+            Sets of measurements from which to form predictions.
+            The measurements should be taken at the sensor locations specified by
+            ``self.get_selected_sensors()``.
+
+        method, prior, noise, solve_kws:
+            See :meth:`predict`.
+
+        Returns
+        -------
+        ys: list of numpy arrays
+            Predicted values at every location, one array per entry of ``xs``
+            with shape (n_samples_i, n_features) (or (n_features,) for
+            one-dimensional entries).
+        """
+        check_is_fitted(self, "ranked_sensors_")
+        sensors = self.ranked_sensors_[: self.n_sensors]
+        xs = [validate_input(x, sensors) for x in xs]
+        if len(xs) == 0:
+            return []
+
+        y = self._predict(
+            np.vstack(xs),
+            sensors,
+            method=method,
+            prior=prior,
+            noise=noise,
+            **solve_kws,
+        )
+        splits = np.cumsum([1 if x.ndim == 1 else x.shape[0] for x in xs])[:-1]
+        return [
+            y_i[0] if x.ndim == 1 else y_i
+            for x, y_i in zip(xs, np.split(y, splits, axis=0))
+        ]
+
+    def _resolve_prior_and_noise(self, prior, noise):
+        """
+        Validate the ``prior`` and ``noise`` arguments of the regularized
+        methods, returning the prior as an array along with the noise level.
+
+        ``prior='decreasing'`` selects the normalized singular values, and a
+        ``noise`` of None defaults (with a warning) to the mean of the prior.
+        """
+        if isinstance(prior, str) and prior == "decreasing":
+            computed_prior = self.singular_values
+        elif isinstance(prior, np.ndarray):
+            if prior.ndim != 1:
+                raise ValueError("prior must be a 1D array")
+            if prior.shape[0] != self.basis_matrix_.shape[1]:
+                raise ValueError(
+                    f"prior must be of shape {(self.basis_matrix_.shape[1],)},"
+                    f" but got {prior.shape}"
+                )
+            computed_prior = prior
+        else:
+            raise ValueError(
+                "Invalid prior: must be 'decreasing' or a 1D "
+                "ndarray of appropriate length."
+            )
+        if noise is None:
+            warnings.warn(
+                "noise is None. noise will be set to the average of the computed prior"
+            )
+            noise = computed_prior.mean()
+        return computed_prior, noise
+
+    def _regularized_reconstruction(self, x, prior, noise, out=None, sensors=None):
         """
         Reconstruct the state using regularized reconstruction
 
@@ -282,29 +448,349 @@ class SSPOR(BaseEstimator):
 
         noise: float (default None)
             Magnitude of the gaussian uncorrelated sensor measurement noise
+
+        out: numpy array, shape (n_samples, n_features), optional (default None)
+            Array in which to place the reconstruction
+
+        sensors: numpy array, shape (n_sensors,), optional (default None)
+            The selected sensors, if already known
         """
-        prior_cov = 1 / (prior**2)
-        low_rank_selection_matrix = self.basis_matrix_[self.selected_sensors, :]
-        composite_matrix = np.diag(prior_cov) + (
-            low_rank_selection_matrix.T @ low_rank_selection_matrix
-        ) / (noise**2)
-        rhs = low_rank_selection_matrix.T @ x
-        reconstructed_state = self.basis_matrix_ @ np.linalg.solve(
-            composite_matrix, rhs / noise**2
+        if sensors is None:
+            sensors = self.ranked_sensors_[: self.n_sensors]
+        low_rank_selection_matrix, factor = self._composite_cholesky(
+            sensors, prior, noise
         )
-        return reconstructed_state.T
+        # Form the product transposed so rhs comes out Fortran-ordered and
+        # cho_solve can overwrite it (a temporary) without another copy
+        rhs = np.matmul(x.T, low_rank_selection_matrix).T
+        rhs /= noise**2
+        with _limit_blas_threads(low_rank_selection_matrix.shape[1]):
+            coef = cho_solve(factor, rhs, overwrite_b=True, check_finite=False)
+        return self._lift(coef, out=out)
+
+    def _composite_cholesky(self, sensors, prior, noise):
+        """
+        Get ``self.basis_matrix_[sensors, :]`` along with the Cholesky factor of
+        the composite matrix ``diag(1 / prior**2) + A.T @ A / noise**2`` of the
+        regularized reconstruction, as returned by ``cho_factor``.
 
-    def _square_predict(self, x, sensors, **solve_kws):
+        The composite matrix is symmetric positive definite, so solving with its
+        Cholesky factor takes two triangular solves (LAPACK potrs) and no
+        explicit inverse is ever formed.
+        """
+        low_rank_selection_matrix, gram = self._get_selected_basis(sensors)
+        # gram is cached and must not be modified, but the scaled copy can be
+        composite_matrix = gram / (noise**2)
+        composite_matrix.flat[:: composite_matrix.shape[0] + 1] += 1 / (prior**2)
+        with _limit_blas_threads(composite_matrix.shape[0]):
+            factor = cho_factor(
+                composite_matrix, lower=True, overwrite_a=True, check_finite=False
+            )
+        return low_rank_selection_matrix, factor
+
+    def _square_predict(self, x, sensors, out=None, **solve_kws):
         """Get prediction when the problem is square."""
-        return np.dot(
-            self.basis_matrix_, solve(self.basis_matrix_[sensors, :], x, **solve_kws)
-        ).T
+        return self._lift(self._square_coefficients(x, sensors, **solve_kws), out=out)
 
-    def _rectangular_predict(self, x, sensors, **solve_kws):
+    def _rectangular_predict(self, x, sensors, out=None, **solve_kws):
         """Get prediction when the problem is rectangular."""
-        return np.dot(
-            self.basis_matrix_, lstsq(self.basis_matrix_[sensors, :], x, **solve_kws)[0]
-        ).T
+        return self._lift(
+            self._rectangular_coefficients(x, sensors, **solve_kws), out=out
+        )
+
+    def _square_coefficients(self, x, sensors, **solve_kws):
+        """Get the basis coefficients when the problem is square."""
+        if solve_kws:
+            # Fancy indexing returns a copy, which LAPACK may overwrite
+            solve_kws = {"overwrite_a": True, "check_finite": False, **solve_kws}
+            with _limit_blas_threads(len(sensors)):
+                return solve(self.basis_matrix_[sensors, :], x, **solve_kws)
+        return self._factored_solve(x, sensors)
+
+    def _rectangular_coefficients(self, x, sensors, **solve_kws):
+        """Get the basis coefficients when the problem is rectangular."""
+        if solve_kws:
+            # A pivoted QR (gelsy) is cheaper than the default SVD (gelsd)
+            solve_kws = {
+                "overwrite_a": True,
+                "check_finite": False,
+                "lapack_driver": "gelsy",
+                **solve_kws,
+            }
+            size = max(len(sensors), self.basis_matrix_.shape[1])
+            with _limit_blas_threads(size):
+                return lstsq(self.basis_matrix_[sensors, :], x, **solve_kws)[0]
+        return self._factored_solve(x, sensors)
+
+    def _residual_sum_of_squares(self, coef, x):
+        """
+        Compute ``np.sum((self._lift(coef) - x) ** 2)`` without forming the full
+        reconstruction, by lifting ``RESIDUAL_CHUNK_SIZE`` features at a time.
+
+        ``coef`` may also be a stack of coefficients, of shape
+        (n_basis_modes, n_samples, n_stack), in which case they are all lifted
+        with one matrix product per chunk and an array of n_stack sums of
+        squares is returned.
+        """
+        stacked = coef.ndim == 3
+        if not stacked:
+            coef = coef[:, :, np.newaxis]
+        n_basis_modes, n_samples, n_stack = coef.shape
+        coef = coef.reshape(n_basis_modes, -1)
+        # Keep the lifted chunk at RESIDUAL_CHUNK_SIZE * n_samples entries
+        chunk_size = max(1, RESIDUAL_CHUNK_SIZE // n_stack)
+
+        n_features = self.basis_matrix_.shape[0]
+        ssq = np.zeros(n_stack)
+        for start in range(0, n_features, chunk_size):
+            stop = start + chunk_size
+            residual = (self.basis_matrix_[start:stop] @ coef).reshape(
+                -1, n_samples, n_stack
+            )
+            residual -= x[:, start:stop].T[:, :, np.newaxis]
+            ssq += np.einsum("ijk,ijk->k", residual, residual)
+        return ssq if stacked else ssq[0]
+
+    def _lifted_row_sq_norms(self, coef):
+        """
+        Compute the squared row norms of ``self.basis_matrix_ @ coef`` without
+        forming the full product, by lifting ``RESIDUAL_CHUNK_SIZE`` features
+        at a time.
+        """
+        n_features = self.basis_matrix_.shape[0]
+        sq_norms = np.empty(n_features, dtype=np.result_type(self.basis_matrix_, coef))
+        for start in range(0, n_features, RESIDUAL_CHUNK_SIZE):
+            stop = start + RESIDUAL_CHUNK_SIZE
+            lifted = self.basis_matrix_[start:stop] @ coef
+            np.einsum("ij,ij->i", lifted, lifted, out=sq_norms[start:stop])
+        return sq_norms
+
+    def _get_selected_basis(self, sensors):
+        """
+        Get ``self.basis_matrix_[sensors, :]`` as a Fortran-ordered array,
+        along with its Gram matrix ``A.T @ A``, reusing the previous ones if
+        neither the basis nor the sensors have changed.
+        Only the lower triangle of the (symmetric) Gram matrix is filled in.
+        The returned arrays are shared between calls and must not be modified.
+        """
+        sensors = np.asarray(sensors)
+        key = sensors.tobytes()
+        cached = self._basis_selection
+        if cached is None or cached[0] is not self.basis_matrix_ or cached[1] != key:
+            selection = self._basis_rows(sensors, order="F")
+            # A symmetric rank-k update takes half the flops of a general product
+            syrk = get_blas_funcs("syrk", (selection,))
+            gram = syrk(1.0, selection, trans=1, lower=1)
+            cached = (self.basis_matrix_, key, selection, gram)
+            self._basis_selection = cached
+        return cached[2], cached[3]
+
+    def _has_orthonormal_basis(self):
+        """
+        Check whether the columns of ``self.basis_matrix_`` are orthonormal, as
+        they are for SVD-based bases, reusing the previous answer if the basis
+        has not changed.
+        """
+        cached = self._orthonormal_basis
+        if cached is None or cached[0] is not self.basis_matrix_:
+            gram = self.basis_matrix_.T @ self.basis_matrix_
+            gram.flat[:: gram.shape[0] + 1] -= 1
+            tol = np.sqrt(np.finfo(gram.dtype).eps)
+            cached = (self.basis_matrix_, bool(np.all(np.abs(gram) <= tol)))
+            self._orthonormal_basis = cached
+        return cached[1]
+
+    def _lift(self, coef, out=None):
+        """
+        Map basis coefficients, shape (n_basis_modes, n_samples), to states,
+        shape (n_samples, n_features), writing into ``out`` if it is given.
+        """
+        return np.matmul(coef.T, self.basis_matrix_.T, out=out)
+
+    def _get_factorization(self, sensors):
+        """
+        Get the factorization of ``self.basis_matrix_[sensors, :]`` computed by
+        :meth:`_factor`.
+
+        The factorizations of the last ``FACTORIZATION_CACHE_SIZE`` sensor sets
+        are kept, so switching back and forth between a few values of
+        ``n_sensors`` does not refactor the basis. The cache is dropped
+        whenever ``basis_matrix_`` changes.
+        """
+        sensors = np.asarray(sensors)
+        key = sensors.tobytes()
+        if self._factorizations is None or (
+            self._factorizations[0] is not self.basis_matrix_
+        ):
+            self._factorizations = (self.basis_matrix_, OrderedDict())
+        cache = self._factorizations[1]
+        if key in cache:
+            cache.move_to_end(key)
+            return cache[key]
+
+        factors = self._factor_rows(sensors)
+        cache[key] = factors
+        if len(cache) > FACTORIZATION_CACHE_SIZE:
+            cache.popitem(last=False)
+        return factors
+
+    def _basis_rows(self, sensors, order="C"):
+        """
+        Get ``self.basis_matrix_[sensors, :]`` as a new array with the given
+        memory layout ({'C', 'F'}).
+        """
+        if order == "F":
+            # basis_matrix_ is Fortran-ordered, so gathering columns of its
+            # (C-ordered) transpose gives the Fortran-ordered rows in one copy
+            return np.asfortranarray(self.basis_matrix_.T[:, sensors].T)
+        return np.ascontiguousarray(self.basis_matrix_[sensors, :])
+
+    def _factor_rows(self, sensors):
+        """
+        Factor ``self.basis_matrix_[sensors, :]`` with :meth:`_factor`, gathering
+        the rows in the layout LAPACK can overwrite without copying them again.
+        """
+        # _factor runs QR on the selection itself if it is tall and on its
+        # transpose if it is wide; LAPACK works on Fortran-ordered arrays
+        tall = len(sensors) >= self.basis_matrix_.shape[1]
+        rows = self._basis_rows(sensors, order="F" if tall else "C")
+        with _limit_blas_threads(max(rows.shape)):
+            return self._factor(rows)
+
+    @staticmethod
+    def _factor(A):
+        """
+        Compute a rank-revealing factorization of ``A``, which may be overwritten.
+
+        ``A`` (or its transpose, if ``A`` has fewer rows than columns) is
+        factored with column-pivoted QR. Its numerical rank is read off
+        the diagonal of ``R`` and the trailing part of the factorization is
+        discarded; if ``A`` turns out to be rank deficient, a second QR of the
+        truncated triangular factor yields a complete orthogonal decomposition.
+        The factorization is returned as a tuple
+        ``(row_perm, left, T, trans, right, col_perm)`` such that the minimum norm
+        least squares solution of ``A @ z = b`` is obtained by
+        ``z[col_perm] = right @ solve_triangular(T, left.T @ b[row_perm], trans)``,
+        where ``None`` entries are skipped. This matches ``scipy.linalg.lstsq``
+        for well-conditioned systems and stays stable for (nearly) singular ones.
+        """
+        tall = A.shape[0] >= A.shape[1]
+        # The basis was validated at fit time and A is a fresh copy of part of it
+        Q, R, P = qr(
+            A if tall else A.T,
+            mode="economic",
+            pivoting=True,
+            overwrite_a=True,
+            check_finite=False,
+        )
+
+        diag = np.abs(np.diag(R))
+        tol = max(A.shape) * np.finfo(R.dtype).eps * (diag[0] if diag.size else 0)
+        rank = int(np.count_nonzero(diag > tol))
+
+        if rank == R.shape[0]:
+            if tall:
+                return (None, Q, R, "N", None, P)
+            else:
+                return (P, None, R, "T", Q, None)
+
+        # A complete orthogonal decomposition of the leading rank rows of R
+        U, S = qr(R[:rank].T, mode="economic", check_finite=False)
+        if tall:
+            return (None, Q[:, :rank], S, "T", U, P)
+        else:
+            return (P, U, S, "N", Q[:, :rank], None)
+
+    @staticmethod
+    def _solve_factored(factors, x):
+        """Solve ``A @ coef = x`` for ``coef`` given ``factors = _factor(A)``."""
+        row_perm, left, T, trans, right, col_perm = factors
+        if row_perm is not None:
+            x = x[row_perm]
+        if left is not None:
+            # Transposed product, so x comes out Fortran-ordered for LAPACK
+            x = np.matmul(x.T, left).T
+        # x has been copied by the permutation or the product with left
+        coef = solve_triangular(T, x, trans=trans, overwrite_b=True, check_finite=False)
+        if right is not None:
+            coef = right @ coef
+        if col_perm is not None:
+            permuted, coef = coef, np.empty_like(coef)
+            coef[col_perm] = permuted
+        return coef
+
+    def _factored_solve(self, x, sensors):
+        """Solve ``self.basis_matrix_[sensors, :] @ coef = x`` for ``coef``."""
+        factors = self._get_factorization(sensors)
+        with _limit_blas_threads(max(len(sensors), self.basis_matrix_.shape[1])):
+            return self._solve_factored(factors, x)
+
+    def _nested_coefficients(self, x, sensor_range):
+        """
+        Compute the (minimum norm, least squares) basis coefficients obtained
+        from the measurements at the top ``n`` ranked sensors, for each ``n`` in
+        ``sensor_range``.
+
+        The sensor sets are nested, so for ``n <= n_basis_modes`` a single QR
+        factorization of the transpose of the sensor submatrix for the largest
+        such ``n`` serves every smaller ``n`` as well: its leading ``n`` columns
+        are the QR factorization of the transpose of the submatrix for ``n``.
+        Likewise a single triangular solve covers all of these ``n``.
+        Larger (overdetermined) sensor sets, and prefixes on which that
+        factorization is numerically singular, are factored individually
+        with :meth:`_factor`.
+
+        Parameters
+        ----------
+        x: numpy array, shape (n_features, n_samples) or (n_features,)
+            Measurements at every location.
+
+        sensor_range: 1D array-like of ints
+            Numbers of sensors for which to compute coefficients.
+
+        Returns
+        -------
+        coefs: generator of numpy arrays, each of shape (n_basis_modes, n_samples)
+            or (n_basis_modes,)
+        """
+        ranked = np.asarray(self.ranked_sensors_)
+        n_basis_modes = self.basis_matrix_.shape[1]
+        n_max = min(max(sensor_range, default=0), len(ranked))
+        x_ranked = x[ranked[:n_max]]
+
+        n_nested = min(n_max, n_basis_modes)
+        if n_nested > 0:
+            with _limit_blas_threads(n_basis_modes):
+                Q, R = qr(
+                    self.basis_matrix_[ranked[:n_nested], :].T,
+                    mode="economic",
+                    overwrite_a=True,
+                    check_finite=False,
+                )
+            diag = np.abs(np.diag(R))
+            tol = max(n_nested, n_basis_modes) * np.finfo(R.dtype).eps * diag[0]
+            singular = np.flatnonzero(diag <= tol)
+            n_nested = singular[0] if singular.size else n_nested
+            # R.T is lower triangular, so forward substitution for the largest
+            # prefix also yields the solution for every shorter one
+            with _limit_blas_threads(n_basis_modes):
+                y = solve_triangular(
+                    R[:n_nested, :n_nested], x_ranked[:n_nested], trans="T"
+                )
+
+        for n_sensors in sensor_range:
+            n = min(n_sensors, n_max)
+            if n == 0:
+                yield np.zeros((n_basis_modes,) + x.shape[1:], dtype=x_ranked.dtype)
+            elif n <= n_nested:
+                with _limit_blas_threads(n_basis_modes):
+                    coef = Q[:, :n] @ y[:n]
+                yield coef
+            else:
+                factors = self._factor_rows(ranked[:n])
+                with _limit_blas_threads(n):
+                    coef = self._solve_factored(factors, x_ranked[:n])
+                yield coef
 
     def get_selected_sensors(self):
         """
@@ -480,7 +966,8 @@ class SSPOR(BaseEstimator):
         score: float
             The score.
         """
-        check_is_fitted(self, "ranked_sensors_")
+        # get_selected_sensors checks that the model has been fit
+        sensors = self.get_selected_sensors()
 
         n_input_features = len(x) if np.ndim(x) == 1 else x.shape[1]
         n_expected_features = len(self.ranked_sensors_)
@@ -490,17 +977,15 @@ class SSPOR(BaseEstimator):
                 f"but should have {n_expected_features}"
             )
 
-        sensors = self.get_selected_sensors()
         if score_function is None:
-            return -np.sqrt(
-                np.mean(
-                    (
-                        self.predict(x[:, sensors], method="unregularized", **solve_kws)
-                        - x
-                    )
-                    ** 2
-                )
-            )
+            # Accumulate the squared residual in chunks of features rather than
+            # materializing the full (n_examples, n_features) prediction
+            x_sensors = as_dtype(x[:, sensors].T, self.dtype)
+            if len(sensors) == self.basis_matrix_.shape[1]:
+                coef = self._square_coefficients(x_sensors, sensors, **solve_kws)
+            else:
+                coef = self._rectangular_coefficients(x_sensors, sensors, **solve_kws)
+            return -np.sqrt(self._residual_sum_of_squares(coef, x) / x.size)
         else:
             return score_function(
                 x,
@@ -536,7 +1021,7 @@ class SSPOR(BaseEstimator):
             Reconstruction scores for each number of sensors in ``sensor_range``.
         """
         check_is_fitted(self, "ranked_sensors_")
-        x_test = validate_input(x_test, self.get_all_sensors()).T
+        x_test = as_dtype(validate_input(x_test, self.ranked_sensors_).T, self.dtype)
 
         basis_mode_dim, n_basis_modes = self.basis_matrix_.shape
         if sensor_range is None:
@@ -546,13 +1031,52 @@ class SSPOR(BaseEstimator):
                 f"Performance may be poor when using more than {basis_mode_dim} sensors"
             )
 
-        if score is None:
+        default_score = score is None
+        if default_score:
 
             def score(x, y):
                 return np.sqrt(np.mean((x - y) ** 2))
 
         error = np.zeros_like(sensor_range, dtype=np.float64)
 
+        if not solve_kws:
+            coefs = self._nested_coefficients(x_test, sensor_range)
+            if default_score and self._has_orthonormal_basis():
+                # With orthonormal basis modes the squared residual splits into
+                # ||coef - basis.T @ x||^2 plus the (fixed) squared residual of
+                # the projection onto the basis, so nothing is lifted per n
+                projection = self.basis_matrix_.T @ x_test
+                ssq_out = self._residual_sum_of_squares(
+                    projection.reshape(n_basis_modes, -1),
+                    x_test.reshape(basis_mode_dim, -1).T,
+                )
+                for k, coef in enumerate(coefs):
+                    diff = (coef - projection).ravel()
+                    error[k] = np.sqrt((diff @ diff + ssq_out) / x_test.size)
+                return error
+            if default_score:
+                # Lift the coefficients for several numbers of sensors together,
+                # stacking only as many as fit in COEFFICIENT_STACK_SIZE entries
+                x_flat = x_test.reshape(basis_mode_dim, -1).T
+                batch_size = max(
+                    1, COEFFICIENT_STACK_SIZE // (n_basis_modes * x_flat.shape[0])
+                )
+                start = 0
+                while start < len(error):
+                    batch = [
+                        coef.reshape(n_basis_modes, -1)
+                        for coef in islice(coefs, batch_size)
+                    ]
+                    stop = start + len(batch)
+                    error[start:stop] = self._residual_sum_of_squares(
+                        np.stack(batch, axis=-1), x_flat
+                    )
+                    start = stop
+                return np.sqrt(error / x_test.size)
+            for k, coef in enumerate(coefs):
+                error[k] = score(self._lift(coef), x_test.T)
+            return error
+
         for k, n_sensors in enumerate(sensor_range):
             if n_sensors == n_basis_modes:
                 error[k] = score(
@@ -630,40 +1154,16 @@ class SSPOR(BaseEstimator):
             Level of uncertainty of each pixel of the reconstructed state
 
         """
-        check_is_fitted(self, "basis_matrix_")
-        if isinstance(prior, str) and prior == "decreasing":
-            computed_prior = self.singular_values
-        elif isinstance(prior, np.ndarray):
-            if prior.ndim != 1:
-                raise ValueError("prior must be a 1D array")
-            if prior.shape[0] != self.basis_matrix_.shape[1]:
-                raise ValueError(
-                    f"prior must be of shape {(self.basis_matrix_.shape[1],)},"
-                    f" but got {prior.shape}"
-                )
-            computed_prior = prior
-        else:
-            raise ValueError(
-                "Invalid prior: must be 'decreasing' or a 1D "
-                "ndarray of appropriate length."
-            )
-        if noise is None:
-            warnings.warn(
-                "noise is None. noise will be set to the average of the computed prior"
-            )
-            noise = computed_prior.mean()
-        sq_inv_prior = 1.0 / (computed_prior**2)
-        low_rank_selection_matrix = self.basis_matrix_[self.selected_sensors, :]
-        composite_matrix = np.diag(sq_inv_prior) + (
-            low_rank_selection_matrix.T @ low_rank_selection_matrix
-        ) / (noise**2)
-        diag_cov_matrix = (
-            self.basis_matrix_
-            @ np.linalg.inv(composite_matrix)
-            @ low_rank_selection_matrix.T
-            / (noise**2)
+        check_is_fitted(self, ["basis_matrix_", "ranked_sensors_"])
+        computed_prior, noise = self._resolve_prior_and_noise(prior, noise)
+        low_rank_selection_matrix, factor = self._composite_cholesky(
+            self.ranked_sensors_[: self.n_sensors], computed_prior, noise
         )
-        sigma = noise * np.sqrt(np.sum(diag_cov_matrix**2, axis=1))
+        with _limit_blas_threads(low_rank_selection_matrix.shape[1]):
+            gain = cho_solve(factor, low_rank_selection_matrix.T, check_finite=False)
+        # The rows of basis_matrix_ @ gain / noise**2 are the rows of the
+        # (n_features, n_sensors) posterior gain; only their norms are needed
+        sigma = np.sqrt(self._lifted_row_sq_norms(gain)) / noise
         return sigma
 
     def one_pt_energy_landscape(self, prior="decreasing", noise=None):
@@ -698,29 +1198,11 @@ class SSPOR(BaseEstimator):
             raise TypeError(
                 "Energy landscapes can only be computed if TPGR optimizer is used."
             )
-        if isinstance(prior, str) and prior == "decreasing":
-            computed_prior = self.singular_values
-        elif isinstance(prior, np.ndarray):
-            if prior.ndim != 1:
-                raise ValueError("prior must be a 1D array")
-            if prior.shape[0] != self.basis_matrix_.shape[1]:
-                raise ValueError(
-                    f"prior must be of shape {(self.basis_matrix_.shape[1],)},"
-                    f" but got {prior.shape}"
-                )
-            computed_prior = prior
-        else:
-            raise ValueError(
-                "Invalid prior: must be 'decreasing' or a 1D "
-                "ndarray of appropriate length."
-            )
-        if noise is None:
-            warnings.warn(
-                "noise is None. noise will be set to the average of the computed prior"
-            )
-            noise = computed_prior.mean()
-        G = self.basis_matrix_ @ np.diag(computed_prior)
-        return -np.log(1 + np.einsum("ij,ij->i", G, G) / noise**2)
+        computed_prior, noise = self._resolve_prior_and_noise(prior, noise)
+        # ||basis_matrix_[i, :] * computed_prior||^2 for every sensor i, as a
+        # single matrix-vector product
+        G_sq_norms = (self.basis_matrix_**2) @ (computed_prior**2)
+        return -np.log1p(G_sq_norms / noise**2)
 
     def two_pt_energy_landscape(self, selected_sensors, prior="decreasing", noise=None):
         """
@@ -761,46 +1243,38 @@ class SSPOR(BaseEstimator):
             raise TypeError(
                 "Energy landscapes can only be computed if TPGR optimizer is used."
             )
-        check_is_fitted(self, "optimizer")
-        if isinstance(prior, str) and prior == "decreasing":
-            computed_prior = self.singular_values
-        elif isinstance(prior, np.ndarray):
-            if prior.ndim != 1:
-                raise ValueError("prior must be a 1D array")
-            if prior.shape[0] != self.basis_matrix_.shape[1]:
-                raise ValueError(
-                    f"prior must be of shape {(self.basis_matrix_.shape[1],)},"
-                    f" but got {prior.shape}"
-                )
-            computed_prior = prior
-        else:
-            raise ValueError(
-                "Invalid prior: must be 'decreasing' or a 1D "
-                "ndarray of appropriate length."
-            )
-        if noise is None:
-            warnings.warn(
-                "noise is None. noise will be set to the average of the computed prior"
-            )
-            noise = computed_prior.mean()
-        G = self.basis_matrix_ @ np.diag(computed_prior)
-        mask = np.ones(G.shape[0], dtype=bool)
-        mask[selected_sensors] = False
-        G_selected = G[selected_sensors, :]
-        if len(selected_sensors) == 1:
-            G_selected.reshape(-1, 1)
-        G_remaining = G[mask, :]
-        J = 0.5 * np.sum(
-            ((G_remaining @ G_selected.T) ** 2)
-            / (
-                np.outer(
-                    1 + (np.sum(G_remaining**2, axis=1)) / noise**2,
-                    1 + (np.sum(G_selected**2, axis=1)) / noise**2,
-                )
-                * noise**4
-            ),
-            axis=1,
+        computed_prior, noise = self._resolve_prior_and_noise(prior, noise)
+        # G is the basis with its columns scaled by the prior and, as in the
+        # one-point case, sensor i contributes 1 + ||G[i, :]||^2 / noise^2.
+        # The interaction of sensor i with sensor j is
+        # (G[i] @ G[j])^2 / (one_pt[i] * one_pt[j] * noise^4), so summing over
+        # the selected j is a matrix-vector product with the weights below.
+        noise_sq = noise**2
+        G_selected = self.basis_matrix_[selected_sensors, :] * computed_prior
+        one_pt_selected = 1 + np.einsum("ij,ij->i", G_selected, G_selected) / noise_sq
+        weights = 1 / (one_pt_selected * noise_sq**2)
+        # Sweep over RESIDUAL_CHUNK_SIZE sensors at a time, scaling, reducing and
+        # normalising each block while it is in cache, so neither G, the squared
+        # basis nor the (n_features, n_selected) interactions are formed in full.
+        # The scaled rows and their interactions go into buffers allocated once
+        # and refilled for every chunk.
+        n_features = self.basis_matrix_.shape[0]
+        chunk_size = min(RESIDUAL_CHUNK_SIZE, n_features)
+        scaled = np.empty((chunk_size, G_selected.shape[1]), dtype=G_selected.dtype)
+        interactions = np.empty(
+            (chunk_size, G_selected.shape[0]), dtype=G_selected.dtype
         )
-        J_full = np.full(G.shape[0], np.nan)
-        J_full[mask] = J
+        J_full = np.empty(n_features, dtype=weights.dtype)
+        for start in range(0, n_features, chunk_size):
+            stop = min(start + chunk_size, n_features)
+            G_chunk = scaled[: stop - start]
+            inter_chunk = interactions[: stop - start]
+            np.multiply(self.basis_matrix_[start:stop], computed_prior, out=G_chunk)
+            np.matmul(G_chunk, G_selected.T, out=inter_chunk)
+            inter_chunk **= 2
+            np.matmul(inter_chunk, weights, out=J_full[start:stop])
+            J_full[start:stop] /= 2 * (
+                1 + np.einsum("ij,ij->i", G_chunk, G_chunk) / noise_sq
+            )
+        J_full[selected_sensors] = np.nan
         return J_full
@@ -1,4 +1,4 @@
-from ._base import validate_input
+from ._base import as_dtype, fit_basis, validate_input
 from ._constraints import (
     BaseConstraint,
     Circle,
@@ -8,6 +8,7 @@ from ._constraints import (
     Parabola,
     Polygon,
     UserDefinedConstraints,
+    constraint_matrix,
     get_constrained_sensors_indices,
     get_constrained_sensors_indices_dataframe,
     get_coordinates_from_indices,
@@ -26,6 +27,8 @@ __all__ = [
     "constrained_binary_solve",
     "constrained_multiclass_solve",
     "validate_input",
+    "fit_basis",
+    "as_dtype",
     "get_constraind_sensors_indices",
     "get_constrained_sensors_indices_linear",
     "BaseConstraint",
@@ -37,6 +40,7 @@ __all__ = [
     "UserDefinedConstraints" "box_constraints",
     # "constraints_eval",
     "functional_constraints",
+    "constraint_matrix",
     "get_coordinates_from_indices",
     "get_indices_from_coordinates",
     "exact_n",
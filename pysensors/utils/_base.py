@@ -2,7 +2,10 @@
 Various utility functions.
 """
 
+import warnings
+
 import numpy as np
+from sklearn.utils.validation import check_is_fitted
 
 
 def validate_input(x, sensors=None):
@@ -29,3 +32,68 @@ def validate_input(x, sensors=None):
             )
 
     return x
+
+
+def as_dtype(x, dtype=None):
+    """
+    Cast an array to dtype, if one was specified.
+
+    Parameters
+    ----------
+    x: numpy ndarray
+        Array to be cast. Other objects are returned unchanged.
+
+    dtype: numpy dtype, optional (default None)
+        The dtype to cast to. If None, x is returned unchanged.
+
+    Returns
+    -------
+    x: numpy ndarray
+        x cast to dtype, without copying if it already has that dtype.
+    """
+    if dtype is None or not isinstance(x, np.ndarray):
+        return x
+    return x.astype(dtype, copy=False)
+
+
+def fit_basis(basis, x, prefit_basis=False, quiet=False):
+    """
+    Fit a basis to x, or check that it has already been fit.
+
+    A basis fit once can be shared between several models (for example a
+    :class:`pysensors.reconstruction.SSPOR` and a
+    :class:`pysensors.classification.SSPOC` trained on the same data) by
+    passing ``prefit_basis=True`` to their ``fit`` methods, so that the
+    (potentially expensive) basis fit is only performed once.
+
+    Parameters
+    ----------
+    basis: basis object
+        The basis to be fit.
+
+    x: numpy ndarray, shape [n_examples, n_features]
+        Training data.
+
+    prefit_basis: boolean, optional (default False)
+        Whether or not the basis has already been fit to x.
+
+    quiet: boolean, optional (default False)
+        Whether or not to suppress warnings raised while fitting the basis.
+
+    Returns
+    -------
+    x: numpy ndarray, shape [n_examples, n_features]
+        The (validated) training data.
+    """
+    if prefit_basis:
+        check_is_fitted(basis, "basis_matrix_")
+        return x
+
+    x = validate_input(x)
+    if quiet:
+        with warnings.catch_warnings():
+            warnings.filterwarnings("ignore", category=UserWarning)
+            basis.fit(x)
+    else:
+        basis.fit(x)
+    return x
@@ -3,15 +3,22 @@ Various utility functions for mapping constrained sensors locations with the col
 indices for class GQR.
 """
 
+import importlib
+import importlib.util
+import math
 import operator
 import os
 import sys
+from functools import singledispatch
 
 import matplotlib.patches as patches
 import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
 
+# Functions loaded by load_functional_constraints, keyed by absolute file path
+_FUNCTIONAL_CONSTRAINTS = {}
+
 
 def get_constrained_sensors_indices(x_min, x_max, y_min, y_max, nx, ny, all_sensors):
     """
@@ -39,36 +46,40 @@ def get_constrained_sensors_indices(x_min, x_max, y_min, y_max, nx, ny, all_sens
         raise ValueError("all_sensors must be provided")
     if not np.issubdtype(all_sensors.dtype, np.integer):
         raise ValueError("all_sensors must be integers")
+    if all_sensors.ndim != 1:
+        raise ValueError("all_sensors must be a 1D array")
     if x_min >= x_max:
         raise ValueError("x_min must be less than x_max")
     if y_min >= y_max:
         raise ValueError("y_min must be less than y_max")
     if not isinstance(nx, int) or not isinstance(ny, int):
         raise ValueError("nx and ny must be integers")
-    n_features = len(all_sensors)
-    a = np.unravel_index(all_sensors, (nx, ny))
-    constrained_sensorsx = []
-    constrained_sensorsy = []
-    for i in range(n_features):
-        if (a[0][i] >= x_min and a[0][i] <= x_max) and (
-            a[1][i] >= y_min and a[1][i] <= y_max
-        ):
-            constrained_sensorsx.append(a[0][i])
-            constrained_sensorsy.append(a[1][i])
-
-    constrained_sensorsx = np.array(constrained_sensorsx)
-    constrained_sensorsy = np.array(constrained_sensorsy)
-    constrained_sensors_array = np.stack(
-        (constrained_sensorsy, constrained_sensorsx), axis=1
-    )
-    constrained_sensors_tuple = np.transpose(constrained_sensors_array)
-    if (
-        len(constrained_sensorsx) == 0
-    ):  # Check to handle condition when number of sensors in the constrained region = 0
-        idx_constrained = []
+    if all_sensors.min() < 0 or all_sensors.max() >= nx * ny:
+        raise ValueError("all_sensors must be indices into the nx by ny grid")
+    if 8 * len(all_sensors) < nx * ny:
+        # Only a few sensors on a large grid: test their coordinates directly
+        # rather than marking the whole grid
+        rows, cols = np.unravel_index(all_sensors, (nx, ny))
+        mask = (rows >= x_min) & (rows <= x_max) & (cols >= y_min) & (cols <= y_max)
+        rows, cols = rows[mask], cols[mask]
     else:
-        idx_constrained = np.ravel_multi_index(constrained_sensors_tuple, (nx, ny))
-    return idx_constrained
+        # Mark the grid points inside the box with a slice and filter
+        # all_sensors by lookup before computing any coordinates, so only the
+        # sensors that survive the filter are ever unraveled
+        inside = np.zeros((nx, ny), dtype=bool)
+        inside[
+            max(math.ceil(x_min), 0) : max(math.floor(x_max) + 1, 0),
+            max(math.ceil(y_min), 0) : max(math.floor(y_max) + 1, 0),
+        ] = True
+        rows, cols = np.unravel_index(
+            all_sensors[inside.ravel()[all_sensors]], (nx, ny)
+        )
+    if len(rows) == 0:
+        # Handle the case when there are no sensors in the constrained region
+        return []
+    # The coordinates are raveled as (y, x), the column-major (order="F")
+    # convention used by get_coordinates_from_indices
+    return np.ravel_multi_index((cols, rows), (nx, ny))
 
 
 def get_constrained_sensors_indices_dataframe(x_min, x_max, y_min, y_max, df, **kwargs):
@@ -104,17 +115,18 @@ def get_constrained_sensors_indices_dataframe(x_min, x_max, y_min, y_max, df, **
         Y_axis = kwargs["Y_axis"]
     else:
         raise Exception("Must provide Y_axis as **kwargs as your data is a dataframe")
-    if df.isnull().values.any():
-        df = df.dropna()
     x = df[X_axis].to_numpy()
-    n_features = x.shape[0]
     y = df[Y_axis].to_numpy()
+    # Rows with a missing value in any column are dropped and the remaining rows
+    # renumbered, which only needs the two coordinate columns filtered rather
+    # than a copy of the whole dataframe
+    complete = df.notna().to_numpy().all(axis=1)
+    if not complete.all():
+        x = x[complete]
+        y = y[complete]
 
-    idx_constrained = []
-    for i in range(n_features):
-        if (x[i] >= x_min and x[i] < x_max) and (y[i] >= y_min and y[i] < y_max):
-            idx_constrained.append(i)
-    return idx_constrained
+    mask = (x >= x_min) & (x < x_max) & (y >= y_min) & (y < y_max)
+    return np.flatnonzero(mask).tolist()
 
 
 def get_constrained_sensors_indices_distance(j, piv, r, nx, ny, all_sensors):
@@ -141,10 +153,10 @@ def get_constrained_sensors_indices_distance(j, piv, r, nx, ny, all_sensors):
     """
     sensor_idx = max(0, j - 1)
     current_sensor = piv[sensor_idx]
-    current_coords = np.unravel_index([current_sensor], (nx, ny))
-    x_cord, y_cord = current_coords[0][0], current_coords[1][0]
-    sensor_coords = np.unravel_index(all_sensors, (nx, ny))
-    distances_sq = (sensor_coords[0] - x_cord) ** 2 + (sensor_coords[1] - y_cord) ** 2
+    x_cord, y_cord = np.unravel_index(current_sensor, (nx, ny))
+    sensor_x, sensor_y = np.unravel_index(all_sensors, (nx, ny))
+    # Compare squared distances so no square root is taken
+    distances_sq = (sensor_x - x_cord) ** 2 + (sensor_y - y_cord) ** 2
     return all_sensors[distances_sq < r**2]
 
 
@@ -180,11 +192,11 @@ def get_constrained_sensors_indices_distance_df(
     current_sensor = piv[sensor_idx]
     current_x = df.loc[current_sensor, X_axis]
     current_y = df.loc[current_sensor, Y_axis]
-    sensors_df = df.loc[all_sensors]
-    distances_sq = (sensors_df[X_axis] - current_x) ** 2 + (
-        sensors_df[Y_axis] - current_y
-    ) ** 2
-    return all_sensors[distances_sq.values < r**2]
+    # Only gather the two coordinate columns rather than every row of df
+    sensor_x = df[X_axis].loc[all_sensors].to_numpy()
+    sensor_y = df[Y_axis].loc[all_sensors].to_numpy()
+    distances_sq = (sensor_x - current_x) ** 2 + (sensor_y - current_y) ** 2
+    return all_sensors[distances_sq < r**2]
 
 
 def load_functional_constraints(functionHandler):
@@ -197,12 +209,32 @@ def load_functional_constraints(functionHandler):
     Return
     -------
     Convert the functionHandler file into a callable function
+
+    Notes
+    -----
+    Loaded functions are cached by path, so loading the same file again is a
+    dictionary lookup.
     """
-    functionName = os.path.basename(functionHandler).strip(".py")
-    dirName = os.path.dirname(functionHandler)
-    sys.path.insert(0, os.path.expanduser(dirName))
-    module = __import__(functionName)
+    path = os.path.expanduser(functionHandler)
+    key = os.path.abspath(path)
+    if key in _FUNCTIONAL_CONSTRAINTS:
+        return _FUNCTIONAL_CONSTRAINTS[key]
+
+    functionName = os.path.splitext(os.path.basename(path))[0]
+    if os.path.isfile(path):
+        # Load the file directly rather than searching sys.path for it
+        spec = importlib.util.spec_from_file_location(functionName, path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+    else:
+        # Fall back to importing the module by name from its directory or
+        # anywhere else on sys.path
+        dirName = os.path.dirname(path)
+        if dirName not in sys.path:
+            sys.path.insert(0, dirName)
+        module = importlib.import_module(functionName)
     func = getattr(module, functionName)
+    _FUNCTIONAL_CONSTRAINTS[key] = func
     return func
 
 
@@ -226,19 +258,13 @@ def order_constrained_sensors(idx_constrained_list, ranks_list):
     ranks : np.darray, shape [No. of constrained locations], array which contains
     the ranks of constrained sensors.
     """
-    if len(ranks_list) == 0 or len(idx_constrained_list) == 0:
-        sortedConstraints = []
-        ranks = []
-    else:
-        sortedConstraints, ranks = zip(
-            *[
-                [x, y]
-                for x, y in sorted(
-                    zip(idx_constrained_list, ranks_list), key=lambda x: (x[1])
-                )
-            ]
-        )
-    return sortedConstraints, ranks
+    sortedConstraints = np.asarray(idx_constrained_list)
+    ranks = np.asarray(ranks_list)
+    if len(ranks) == 0 or len(sortedConstraints) == 0:
+        return sortedConstraints[:0], ranks[:0]
+    # A stable sort keeps locations that share a rank in their given order
+    order = np.argsort(ranks, kind="stable")
+    return sortedConstraints[order], ranks[order]
 
 
 def get_coordinates_from_indices(idx, info, **kwargs):
@@ -263,34 +289,81 @@ def get_coordinates_from_indices(idx, info, **kwargs):
     Returns:
         (x,y) : tuple, The coordinates on the grid of each sensor.
     """
-    if isinstance(info, np.ndarray):
-        return np.unravel_index(
-            idx, (int(np.sqrt(info.shape[1])), int(np.sqrt(info.shape[1]))), "F"
-        )
-    elif isinstance(info, pd.DataFrame):
-        if set(idx).issubset(np.arange(0, len(info))) is False:
+    return _grid_coordinates(info, idx, **kwargs)
+
+
+@singledispatch
+def _grid_coordinates(info, idx, **kwargs):
+    """
+    Implementation of get_coordinates_from_indices, dispatched on the type of info
+    once per call instead of walking an isinstance chain. Other types of info have
+    no coordinates.
+    """
+    return None
+
+
+@_grid_coordinates.register(np.ndarray)
+def _(info, idx, **kwargs):
+    side = int(np.sqrt(info.shape[1]))
+    return np.unravel_index(idx, (side, side), "F")
+
+
+@_grid_coordinates.register(pd.DataFrame)
+def _(info, idx, **kwargs):
+    idx_array = np.asarray(idx)
+    integer_idx = idx_array.ndim == 1 and np.issubdtype(idx_array.dtype, np.integer)
+    if integer_idx:
+        if len(idx_array) and (idx_array.min() < 0 or idx_array.max() >= len(info)):
             raise Exception("Sensor ID must be within dataframe entries")
-        if "X_axis" in kwargs.keys():
-            X_axis = kwargs["X_axis"]
-        else:
-            raise Exception(
-                "Must provide X_axis as **kwargs as your data is a dataframe"
-            )
-        if "Y_axis" in kwargs.keys():
-            Y_axis = kwargs["Y_axis"]
-        else:
-            raise Exception(
-                "Must provide Y_axis as **kwargs as your data is a dataframe"
-            )
-        if "Z_axis" in kwargs.keys() and kwargs["Z_axis"] is not None:
-            Z_axis = kwargs["Z_axis"]
-            z = info.loc[idx, Z_axis].values
-        else:
-            z = None
-        x = info.loc[idx, X_axis].values
-        y = info.loc[idx, Y_axis].values
+    elif set(idx).issubset(np.arange(0, len(info))) is False:
+        raise Exception("Sensor ID must be within dataframe entries")
+    if "X_axis" in kwargs.keys():
+        X_axis = kwargs["X_axis"]
+    else:
+        raise Exception("Must provide X_axis as **kwargs as your data is a dataframe")
+    if "Y_axis" in kwargs.keys():
+        Y_axis = kwargs["Y_axis"]
+    else:
+        raise Exception("Must provide Y_axis as **kwargs as your data is a dataframe")
+    # With the default RangeIndex the labels are the positions, so the
+    # columns can be gathered positionally from NumPy instead of through
+    # the label-based .loc indexer
+    index = info.index
+    positional = (
+        integer_idx
+        and isinstance(index, pd.RangeIndex)
+        and index.start == 0
+        and index.step == 1
+    )
+    rows = idx_array if positional else idx
+    if "Z_axis" in kwargs.keys() and kwargs["Z_axis"] is not None:
+        Z_axis = kwargs["Z_axis"]
+        z = _dataframe_column(info, Z_axis, rows, positional)
+    else:
+        z = None
+    x = _dataframe_column(info, X_axis, rows, positional)
+    y = _dataframe_column(info, Y_axis, rows, positional)
+
+    return (x, y, z) if z is not None else (x, y)
+
+
+def _image_coordinates(idx, n_features):
+    """
+    Plotting coordinates (x, y) of the sensors idx on a square image with n_features
+    pixels, from a single divmod rather than separate mod and floor passes
+    """
+    y, x = np.divmod(idx, np.sqrt(n_features))
+    return x, y
 
-        return (x, y, z) if z is not None else (x, y)
+
+def _dataframe_column(df, name, rows, positional):
+    """
+    Values of column name at rows, indexed by position when positional is True and
+    by label otherwise
+    """
+    if positional:
+        return df[name].to_numpy()[rows]
+    return df.loc[rows, name].values
 
 
 def get_indices_from_coordinates(coordinates, shape):
@@ -312,6 +385,98 @@ def get_indices_from_coordinates(coordinates, shape):
     return np.ravel_multi_index(coordinates, shape, order="F")
 
 
+def constraint_matrix(constraints, coords):
+    """
+    Function for evaluating several constraint shapes at the same points at once
+
+    Parameters
+    ----------
+    constraints : list of BaseConstraint, the constraint shapes to be evaluated
+    coords : array_like, shape [2, n_points], (x, y) coordinates of the points on
+        the grid, e.g. as returned by get_coordinates_from_indices
+
+    Returns
+    -------
+    G : np.ndarray, shape [len(constraints), n_points], dtype bool
+        G[k] is the constraint mask of constraints[k], i.e. False where the point
+        lies in the region constrained by that shape. The analytic shapes (Circle,
+        Line, Parabola and Ellipse) are grouped by kind and each kind is evaluated
+        for all of its shapes in one broadcast pass; Polygon, Cylinder and
+        user-defined constraints are evaluated one at a time with their own mask.
+    """
+    coords = np.asarray(coords, dtype=float)
+    x, y = coords[0][np.newaxis, :], coords[1][np.newaxis, :]
+    G = np.empty((len(constraints), coords.shape[1]), dtype=bool)
+    batched = {
+        Circle: _circle_masks,
+        Line: _line_masks,
+        Parabola: _parabola_masks,
+        Ellipse: _ellipse_masks,
+    }
+    groups = {}
+    for k, c in enumerate(constraints):
+        kind = type(c)
+        if kind in batched and (kind is not Ellipse or c.loc.lower() in ("in", "out")):
+            groups.setdefault(kind, []).append(k)
+        else:
+            G[k] = c._constraint_mask(coords)
+    for kind, rows in groups.items():
+        G[rows] = batched[kind]([constraints[k] for k in rows], x, y)
+    return G
+
+
+def _shape_parameters(shapes, *names):
+    """
+    The attributes names of each shape in shapes, as columns of shape
+    [len(shapes), 1] that broadcast against a row of points
+    """
+    params = np.array([[getattr(c, name) for name in names] for c in shapes], float)
+    return tuple(params[:, [i]] for i in range(len(names)))
+
+
+def _region_masks(shapes, inside):
+    """
+    Constraint masks of shapes from the region masks inside, one row per shape, for
+    shapes constraining their inside when loc is 'in' and their outside otherwise
+    """
+    constrain_inside = np.array([c.loc.lower() == "in" for c in shapes])
+    return inside != constrain_inside[:, np.newaxis]
+
+
+def _circle_masks(circles, x, y):
+    center_x, center_y, radius = _shape_parameters(
+        circles, "center_x", "center_y", "radius"
+    )
+    inside = (x - center_x) ** 2 + (y - center_y) ** 2 <= radius**2
+    return _region_masks(circles, inside)
+
+
+def _line_masks(lines, x, y):
+    x1, x2, y1, y2 = _shape_parameters(lines, "x1", "x2", "y1", "y2")
+    return (y - y1) * (x2 - x1) - (y2 - y1) * (x - x1) >= 0
+
+
+def _parabola_masks(parabolas, x, y):
+    h, k, a = _shape_parameters(parabolas, "h", "k", "a")
+    return _region_masks(parabolas, a * (x - h) ** 2 <= y - k)
+
+
+def _ellipse_masks(ellipses, x, y):
+    center_x, center_y, angle, half_horizontal, half_vertical = _shape_parameters(
+        ellipses,
+        "center_x",
+        "center_y",
+        "angle",
+        "half_horizontal_axis",
+        "half_vertical_axis",
+    )
+    angle = angle * np.pi / 180
+    u = (x - center_x) * np.cos(angle) + (y - center_y) * np.sin(angle)
+    v = -(x - center_x) * np.sin(angle) + (y - center_y) * np.cos(angle)
+    inside = u**2 / half_horizontal**2 + v**2 / half_vertical**2 <= 1
+    return _region_masks(ellipses, inside)
+
+
 class BaseConstraint(object):
     """
     A General class for handling various functional and user-defined constraint shapes.
@@ -342,6 +507,8 @@ class BaseConstraint(object):
             self.data = kwargs["data"]
         else:
             raise Exception("Must provide data as **kwargs")
+        # Image artist from the last image plot, reused when redrawing on the same axes
+        self._image = None
         if isinstance(self.data, pd.DataFrame):
             if "X_axis" in kwargs.keys():
                 self.X_axis = kwargs["X_axis"]
@@ -366,6 +533,7 @@ class BaseConstraint(object):
                     "Must provide Field as **kwargs as your data is a dataframe"
                 )
 
+    @staticmethod
     def functional_constraints(func, idx, info, **kwargs):
         """
         Function for evaluating the functional constraints.
@@ -422,6 +590,7 @@ class BaseConstraint(object):
         g = func(xLoc, yLoc, **kwargs)
         return g
 
+    @staticmethod
     def get_functionalConstraind_sensors_indices(senID, g):
         """
         Function for finding constrained sensor locations on the grid and their ranks
@@ -440,8 +609,10 @@ class BaseConstraint(object):
         rank of the constrained sensor locations
         """
         assert len(senID) == len(g)
-        idx_constrained = senID[~g].tolist()
-        rank = np.where(np.isin(idx_constrained, senID))[0].tolist()  # ==False
+        idx_constrained = np.asarray(senID)[~np.asarray(g, dtype=bool)]
+        # Every constrained location is drawn from senID, so the ranks are
+        # simply their positions
+        rank = np.arange(len(idx_constrained))
         return idx_constrained, rank
 
     def get_constraint_indices(self, all_sensors, info):
@@ -474,14 +645,23 @@ class BaseConstraint(object):
                 Field=self.Field,
             )
         nDims, nPoints = np.shape(coords)
-        g = np.zeros(nPoints, dtype=bool)
-        for i in range(nPoints):
-            g[i] = self.constraint_function(np.array(coords).reshape(nDims, -1)[:, i])
+        g = self._constraint_mask(np.array(coords).reshape(nDims, -1))
         idx_const, rank = BaseConstraint.get_functionalConstraind_sensors_indices(
             all_sensors, g
         )
         return idx_const, rank
 
+    def _constraint_mask(self, coords):
+        """
+        Evaluate constraint_function at every point of coords, an array of shape
+        [nDims, nPoints]. Shapes whose constraint reduces to array arithmetic override
+        this to evaluate all the points at once.
+        """
+        g = np.zeros(coords.shape[1], dtype=bool)
+        for i in range(coords.shape[1]):
+            g[i] = self.constraint_function(coords[:, i])
+        return g
+
     def draw_constraint(self, plot=None, **kwargs):
         """
         Function for drawing the constraint defined by the user
@@ -527,13 +707,19 @@ class BaseConstraint(object):
         if "color" not in kwargs.keys():
             kwargs["color"] = "red"
         if plot_type == "image":
-            image = self.data[1, :].reshape(1, -1)
-            n_samples, n_features = self.data.shape
-            image_shape = (int(np.sqrt(n_features)), int(np.sqrt(n_features)))
-            for i, comp in enumerate(image):
-                vmax = max(comp.max(), -comp.min())
-                self.ax.imshow(
-                    comp.reshape(image_shape),
+            comp = self.data[1, :]
+            side = int(np.sqrt(self.data.shape[1]))
+            image = comp.reshape(side, side)
+            vmax = max(comp.max(), -comp.min())
+            if self._image is not None and self._image.axes is self.ax:
+                # Redrawing on the same axes: update the existing artist in place
+                # rather than stacking another image on top of it
+                self._image.set_data(image)
+                self._image.set_clim(-vmax, vmax)
+                self.fig.canvas.draw_idle()
+            else:
+                self._image = self.ax.imshow(
+                    image,
                     cmap=plt.cm.gray,
                     interpolation="nearest",
                     vmin=-vmax,
@@ -625,14 +811,14 @@ class BaseConstraint(object):
         """
         n_samples, n_features = self.data.shape
         n_sensors = len(sensors)
-        constrained = sensors[~np.isin(sensors, all_sensors[:n_sensors])]
-        unconstrained = sensors[np.isin(sensors, all_sensors[:n_sensors])]
+        # One membership pass; its complement gives the constrained sensors
+        is_unconstrained = np.isin(sensors, all_sensors[:n_sensors])
+        constrained = sensors[~is_unconstrained]
+        unconstrained = sensors[is_unconstrained]
 
         if isinstance(self.data, np.ndarray):
-            xconst = np.mod(constrained, np.sqrt(n_features))
-            yconst = np.floor(constrained / np.sqrt(n_features))
-            xunconst = np.mod(unconstrained, np.sqrt(n_features))
-            yunconst = np.floor(unconstrained / np.sqrt(n_features))
+            xconst, yconst = _image_coordinates(constrained, n_features)
+            xunconst, yunconst = _image_coordinates(unconstrained, n_features)
 
             self.ax.plot(xconst, yconst, "*", color=color_constrained)
             self.ax.plot(xunconst, yunconst, "*", color=color_unconstrained)
@@ -672,8 +858,7 @@ class BaseConstraint(object):
         n_samples, n_features = self.data.shape
         n_sensors = len(sensors)
         if isinstance(self.data, np.ndarray):
-            xTop = np.mod(sensors, np.sqrt(n_features))
-            yTop = np.floor(sensors / np.sqrt(n_features))
+            xTop, yTop = _image_coordinates(sensors, n_features)
         elif isinstance(self.data, pd.DataFrame):
             xTop, yTop = get_coordinates_from_indices(
                 sensors,
@@ -716,19 +901,18 @@ class BaseConstraint(object):
         n_samples, n_features = self.data.shape
         n_sensors = len(sensors)
 
-        # Fixed logic for finding constrained and unconstrained sensors
-        constrained = sensors[~np.isin(sensors, all_sensors[:n_sensors])]
-        unconstrained = sensors[np.isin(sensors, all_sensors[:n_sensors])]
+        # Fixed logic for finding constrained and unconstrained sensors, with one
+        # membership pass whose complement gives the constrained sensors
+        is_unconstrained = np.isin(sensors, all_sensors[:n_sensors])
+        constrained = sensors[~is_unconstrained]
+        unconstrained = sensors[is_unconstrained]
 
         if isinstance(self.data, np.ndarray):
-            xTop = np.mod(sensors, np.sqrt(n_features))
-            yTop = np.floor(sensors / np.sqrt(n_features))
+            xTop, yTop = _image_coordinates(sensors, n_features)
 
-            xconst = np.mod(constrained, np.sqrt(n_features))
-            yconst = np.floor(constrained / np.sqrt(n_features))
+            xconst, yconst = _image_coordinates(constrained, n_features)
 
-            xunconst = np.mod(unconstrained, np.sqrt(n_features))
-            yunconst = np.floor(unconstrained / np.sqrt(n_features))
+            xunconst, yunconst = _image_coordinates(unconstrained, n_features)
 
             data = np.vstack([sensors, xTop, yTop]).T  # noqa:F841
 
@@ -871,12 +1055,22 @@ class Circle(BaseConstraint):
             it lies inside or outside the constrained region
         """
         x, y = coords[:]
-        inFlag = ((x - self.center_x) ** 2 + (y - self.center_y) ** 2) <= self.radius**2
+        inFlag = self._inside(x, y)
         if self.loc.lower() == "in":
             return not inFlag
         else:
             return inFlag
 
+    def _inside(self, x, y):
+        return ((x - self.center_x) ** 2 + (y - self.center_y) ** 2) <= self.radius**2
+
+    def _constraint_mask(self, coords):
+        inFlag = self._inside(*coords)
+        if self.loc.lower() == "in":
+            return ~inFlag
+        else:
+            return inFlag
+
 
 class Cylinder(BaseConstraint):
     """
@@ -1097,6 +1291,10 @@ class Line(BaseConstraint):
             x - self.x1
         ) >= 0
 
+    def _constraint_mask(self, coords):
+        # constraint_function is plain array arithmetic, so it takes every point
+        return self.constraint_function(coords)
+
 
 class Parabola(BaseConstraint):
     """
@@ -1171,12 +1369,22 @@ class Parabola(BaseConstraint):
             inside or outside the constrained region
         """
         x, y = coords[:]
-        inFlag = (self.a * (x - self.h) ** 2) <= (y - self.k)
+        inFlag = self._inside(x, y)
         if self.loc.lower() == "in":
             return not inFlag
         else:
             return inFlag
 
+    def _inside(self, x, y):
+        return (self.a * (x - self.h) ** 2) <= (y - self.k)
+
+    def _constraint_mask(self, coords):
+        inFlag = self._inside(*coords)
+        if self.loc.lower() == "in":
+            return ~inFlag
+        else:
+            return inFlag
+
 
 class Ellipse(BaseConstraint):
     """
@@ -1267,6 +1475,13 @@ class Ellipse(BaseConstraint):
             inside or outside the constrained region
         """
         x, y = coords[:]
+        inFlag = self._inside(x, y)
+        if self.loc.lower() == "in":
+            return not inFlag
+        elif self.loc.lower() == "out":
+            return inFlag
+
+    def _inside(self, x, y):
         angleInRadians = self.angle * np.pi / 180
         u = (x - self.center_x) * np.cos(angleInRadians) + (y - self.center_y) * np.sin(
             angleInRadians
@@ -1274,13 +1489,16 @@ class Ellipse(BaseConstraint):
         v = -(x - self.center_x) * np.sin(angleInRadians) + (
             y - self.center_y
         ) * np.cos(angleInRadians)
-        inFlag = (
+        return (
             u**2 / self.half_horizontal_axis**2 + v**2 / self.half_vertical_axis**2 <= 1
         )
+
+    def _constraint_mask(self, coords):
         if self.loc.lower() == "in":
-            return not inFlag
+            return ~self._inside(*coords)
         elif self.loc.lower() == "out":
-            return inFlag
+            return self._inside(*coords)
+        return super()._constraint_mask(coords)
 
 
 class Polygon(BaseConstraint):
@@ -1370,6 +1588,31 @@ class Polygon(BaseConstraint):
         else:
             raise ValueError(f"Invalid constraint type: {self.loc}.Must be'in' or'out'")
 
+    def _constraint_mask(self, coords):
+        x, y = coords
+        polygon = self.xy_coords
+        n = len(polygon)
+
+        if n < 3:
+            raise ValueError("Polygon must have at least 3 vertices")
+        inFlag = np.zeros(len(x), dtype=bool)
+
+        # The same even-odd ray casting as constraint_function, one edge at a
+        # time over all the points
+        for i in range(n):
+            x1, y1 = polygon[i]
+            x2, y2 = polygon[(i + 1) % n]
+            if y1 != y2:
+                crosses = (y1 > y) != (y2 > y)
+                x_intersect = x1 + (y - y1) * (x2 - x1) / (y2 - y1)
+                inFlag ^= crosses & (x < x_intersect)
+        if self.loc.lower() == "in":
+            return ~inFlag
+        elif self.loc.lower() == "out":
+            return inFlag
+        else:
+            raise ValueError(f"Invalid constraint type: {self.loc}.Must be'in' or'out'")
+
 
 class UserDefinedConstraints(BaseConstraint):
     """
@@ -1447,84 +1690,18 @@ class UserDefinedConstraints(BaseConstraint):
         ax : axis on which the constraint should be plotted
         """
         if self.file is not None:
-            nConstraints = len([self.functions])
-            G = np.zeros((len(self.all_sensors), nConstraints), dtype=bool)
-            for i in range(nConstraints):
-                if isinstance(self.data, np.ndarray):
-                    temp = BaseConstraint.functional_constraints(
-                        self.functions, self.all_sensors, self.data
-                    )
-                    G[:, i] = [x > 0 for x in temp]
-                    idx_const, rank = (
-                        BaseConstraint.get_functionalConstraind_sensors_indices(
-                            self.all_sensors, G[:, i]
-                        )
-                    )
-                    x_val, y_val = get_coordinates_from_indices(idx_const, self.data)
-                elif isinstance(self.data, pd.DataFrame):
-                    temp = BaseConstraint.functional_constraints(
-                        self.functions,
-                        self.all_sensors,
-                        self.data,
-                        X_axis=self.X_axis,
-                        Y_axis=self.Y_axis,
-                        Field=self.Field,
-                    )
-                    G[:, i] = [x == 0 for x in temp]
-                    idx_const, rank = (
-                        BaseConstraint.get_functionalConstraind_sensors_indices(
-                            self.all_sensors, G[:, i]
-                        )
-                    )
-                    x_val, y_val = get_coordinates_from_indices(
-                        idx_const,
-                        self.data,
-                        Y_axis=self.Y_axis,
-                        X_axis=self.X_axis,
-                        Field=self.Field,
-                    )
+            values = self._functional_values()
+            if isinstance(self.data, np.ndarray):
+                g = values > 0
+            else:
+                g = values == 0
         elif self.equations is not None:
-            nConstraints = len(self.equations)
-            G = np.zeros((len(self.all_sensors), nConstraints), dtype=bool)
-            for i in range(nConstraints):
-                if isinstance(self.data, np.ndarray):
-                    xValue, yValue = get_coordinates_from_indices(
-                        self.all_sensors, self.data
-                    )
-                    for k in range(len(xValue)):
-                        G[k, i] = not eval(
-                            self.equations[i], {"x": xValue[k], "y": yValue[k]}
-                        )
-                    idx_const, rank = (
-                        BaseConstraint.get_functionalConstraind_sensors_indices(
-                            self.all_sensors, G[:, i]
-                        )
-                    )
-                    x_val, y_val = get_coordinates_from_indices(idx_const, self.data)
-                elif isinstance(self.data, pd.DataFrame):
-                    xValue, yValue = get_coordinates_from_indices(
-                        self.all_sensors,
-                        self.data,
-                        Y_axis=self.Y_axis,
-                        X_axis=self.X_axis,
-                        Field=self.Field,
-                    )
-                    for k in range(len(xValue)):
-                        G[k, i] = not eval(
-                            self.equations[i], {"x": xValue[k], "y": yValue[k]}
-                        )
-                    idx_const, rank = (
-                        BaseConstraint.get_functionalConstraind_sensors_indices(
-                            self.all_sensors, G[:, i]
-                        )
-                    )
-                    x_val, y_val = get_coordinates_from_indices(
-                        idx_const,
-                        self.data,
-                        Y_axis=self.Y_axis,
-                        X_axis=self.X_axis,
-                        Field=self.Field,
-                    )
+            xValue, yValue = self._sensor_coordinates(self.all_sensors)
+            g = self._equation_masks(xValue, yValue)[:, -1]
+        idx_const, rank = BaseConstraint.get_functionalConstraind_sensors_indices(
+            self.all_sensors, g
+        )
+        x_val, y_val = self._sensor_coordinates(idx_const)
         ax.scatter(x_val, y_val, s=1)
 
     def constraint(self):
@@ -1533,47 +1710,61 @@ class UserDefinedConstraints(BaseConstraint):
         defined constrained region
         """
         if self.file is not None:
-            nConstraints = len([self.functions])
-            G = np.zeros((len(self.all_sensors), nConstraints), dtype=bool)
-            for i in range(nConstraints):
-                if isinstance(self.data, np.ndarray):
-                    temp = BaseConstraint.functional_constraints(
-                        self.functions, self.all_sensors, self.data
-                    )
-                    G[:, i] = [x >= 0 for x in temp]
-                elif isinstance(self.data, pd.DataFrame):
-                    temp = BaseConstraint.functional_constraints(
-                        self.functions,
-                        self.all_sensors,
-                        self.data,
-                        X_axis=self.X_axis,
-                        Y_axis=self.Y_axis,
-                        Field=self.Field,
-                    )
-                    G[:, i] = [x >= 0 for x in temp]
+            g = self._functional_values() >= 0
         else:
-            G = np.zeros((len(self.all_sensors), 1), dtype=bool)
-            if isinstance(self.data, np.ndarray):
-                xValue, yValue = get_coordinates_from_indices(
-                    self.all_sensors, self.data
-                )
-                for k in range(len(xValue)):
-                    G[k, 0] = not eval(
-                        self.equations[0], {"x": xValue[k], "y": yValue[k]}
-                    )
-            elif isinstance(self.data, pd.DataFrame):
-                xValue, yValue = get_coordinates_from_indices(
-                    self.all_sensors,
-                    self.data,
-                    X_axis=self.X_axis,
-                    Y_axis=self.Y_axis,
-                    Field=self.Field,
-                )
-                for k in range(len(xValue)):
-                    G[k, 0] = not eval(
-                        self.equations[0], {"x": xValue[k], "y": yValue[k]}
-                    )
+            xValue, yValue = self._sensor_coordinates(self.all_sensors)
+            g = self._equation_masks(xValue, yValue)[:, 0]
         idx_const, rank = BaseConstraint.get_functionalConstraind_sensors_indices(
-            self.all_sensors, G[:, 0]
+            self.all_sensors, g
         )
         return idx_const, rank
+
+    def _sensor_coordinates(self, idx):
+        """
+        Coordinates of the sensor locations idx in the constraint's data
+        """
+        if isinstance(self.data, np.ndarray):
+            return get_coordinates_from_indices(idx, self.data)
+        return get_coordinates_from_indices(
+            idx,
+            self.data,
+            X_axis=self.X_axis,
+            Y_axis=self.Y_axis,
+            Field=self.Field,
+        )
+
+    def _functional_values(self):
+        """
+        Evaluate the function loaded from the constraint file at every sensor location
+        """
+        if isinstance(self.data, np.ndarray):
+            values = BaseConstraint.functional_constraints(
+                self.functions, self.all_sensors, self.data
+            )
+        else:
+            values = BaseConstraint.functional_constraints(
+                self.functions,
+                self.all_sensors,
+                self.data,
+                X_axis=self.X_axis,
+                Y_axis=self.Y_axis,
+                Field=self.Field,
+            )
+        return np.asarray(values)
+
+    def _equation_masks(self, xValue, yValue):
+        """
+        Flag the locations violating each equation, one column per equation. The
+        coordinates are computed once by the caller and shared by every equation, and
+        each equation is compiled once rather than parsed again at every location.
+        """
+        G = np.empty((len(xValue), len(self.equations)), dtype=bool, order="F")
+        for i, equation in enumerate(self.equations):
+            code = compile(equation, "<constraint>", "eval")
+            # Stream the flags straight into the column instead of via a list
+            G[:, i] = np.fromiter(
+                (not eval(code, {"x": x, "y": y}) for x, y in zip(xValue, yValue)),
+                dtype=bool,
+                count=len(xValue),
+            )
+        return G
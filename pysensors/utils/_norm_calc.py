@@ -205,6 +205,9 @@ def distance(dlens, piv, j, **kwargs):
     r = kwargs.get("r")
     if r <= 0:
         raise ValueError(f"Radius 'r' must be positive, got {r}")
+    if j > len(piv):
+        # The placed sensors are sliced from piv below, which would not catch this
+        raise IndexError(f"j={j} is out of bounds for piv of length {len(piv)}")
     if isinstance(info, np.ndarray):
         if "nx" not in kwargs:
             raise ValueError("Must provide nx parameter")
@@ -219,16 +222,10 @@ def distance(dlens, piv, j, **kwargs):
             didx = np.isin(piv[j:], idx_constrained)
             dlens[didx] = 0
         else:
-            constrained_mask = np.zeros(len(piv[j:]), dtype=bool)
-            future_coords = np.unravel_index(piv[j:], (nx, ny))
-            for i in range(j):
-                sensor = piv[i]
-                sensor_coords = np.unravel_index([sensor], (nx, ny))
-                x_sensor, y_sensor = sensor_coords[0][0], sensor_coords[1][0]
-                distances_sq = (future_coords[0] - x_sensor) ** 2 + (
-                    future_coords[1] - y_sensor
-                ) ** 2
-                constrained_mask = constrained_mask | (distances_sq < r**2)
+            future_x, future_y = np.unravel_index(piv[j:], (nx, ny))
+            # Unravel the placed sensors together rather than one at a time
+            placed_x, placed_y = np.unravel_index(piv[:j], (nx, ny))
+            constrained_mask = _within_radius(future_x, future_y, placed_x, placed_y, r)
             dlens[constrained_mask] = 0
 
     elif isinstance(info, pd.DataFrame):
@@ -252,17 +249,16 @@ def distance(dlens, piv, j, **kwargs):
             didx = np.isin(piv[j:], idx_constrained)
             dlens[didx] = 0
         else:
-            constrained_mask = np.zeros(len(piv[j:]), dtype=bool)
-            future_indices = piv[j:]
-            future_coords_df = info.loc[future_indices]
-            for i in range(j):
-                sensor_idx = piv[i]
-                sensor_x = info.loc[sensor_idx, X_axis]
-                sensor_y = info.loc[sensor_idx, Y_axis]
-                distances_sq = (future_coords_df[X_axis] - sensor_x) ** 2 + (
-                    future_coords_df[Y_axis] - sensor_y
-                ) ** 2
-                constrained_mask = constrained_mask | (distances_sq.values < r**2)
+            # Materialize the two coordinate columns once, for the future and
+            # the placed sensors, instead of copying every column of the
+            # future rows and looking each placed sensor up separately
+            x_values = info[X_axis]
+            y_values = info[Y_axis]
+            future_x = x_values.loc[piv[j:]].to_numpy()
+            future_y = y_values.loc[piv[j:]].to_numpy()
+            placed_x = x_values.loc[piv[:j]].to_numpy()
+            placed_y = y_values.loc[piv[:j]].to_numpy()
+            constrained_mask = _within_radius(future_x, future_y, placed_x, placed_y, r)
 
             dlens[constrained_mask] = 0
 
@@ -295,3 +291,25 @@ def returnInstance(cls, name):
     if name not in __norm_calc_type:
         raise NotImplementedError("{} NOT IMPLEMENTED!!!!!\n".format(name))
     return __norm_calc_type[name]
+
+
+def _within_radius(future_x, future_y, placed_x, placed_y, r):
+    """
+    Mask of the future sensors lying within r of any placed sensor. The distances to
+    each placed sensor are computed into buffers allocated once per call, since
+    this runs for every placed sensor at every pivot step.
+    """
+    constrained_mask = np.zeros(len(future_x), dtype=bool)
+    distances_sq = np.empty(len(future_x), dtype=np.result_type(future_x, float))
+    dy_sq = np.empty_like(distances_sq)
+    within = np.empty(len(future_x), dtype=bool)
+    r_sq = r**2
+    for sensor_x, sensor_y in zip(placed_x, placed_y):
+        np.subtract(future_x, sensor_x, out=distances_sq)
+        distances_sq *= distances_sq
+        np.subtract(future_y, sensor_y, out=dy_sq)
+        dy_sq *= dy_sq
+        distances_sq += dy_sq
+        np.less(distances_sq, r_sq, out=within)
+        constrained_mask |= within
+    return constrained_mask
@@ -7,6 +7,15 @@ from sklearn.linear_model import MultiTaskLasso, OrthogonalMatchingPursuit
 def constrained_binary_solve(
     w, psi, quiet=False, fit_intercept=True, normalize=True, precompute="auto"
 ):
+    """
+    Solve the sparse sensor problem for binary classification with
+    :code:`sklearn.linear_model.OrthogonalMatchingPursuit`.
+
+    The greedy selection and the Cholesky updates of the orthogonal matching
+    pursuit run in compiled BLAS/LAPACK code inside Scikit-learn; with
+    :code:`precompute="auto"` the Gram matrix of ``psi`` is formed once up front
+    whenever that is cheaper.
+    """
     if ndim(w) != 1:
         raise ValueError(
             f"w must be a 1D vector; received a vector of dimension {ndim(w)}"
@@ -35,6 +44,12 @@ def constrained_multiclass_solve(w, psi, alpha=1.0, quiet=False, **lasso_kws):
 
         \\text{argmin}_s \\|s\\|_0 \\\\
         \\text{subject to} \\|w - \\psi s\\|_2^2 \\leq tol
+
+    via its convex relaxation, solved with
+    :code:`sklearn.linear_model.MultiTaskLasso`. The coordinate descent
+    iterations run in Scikit-learn's compiled (Cython) solver, and
+    ``lasso_kws`` (e.g. ``tol``, ``max_iter``, ``selection="random"``) are
+    passed through to it.
     """
     model = MultiTaskLasso(alpha=alpha, **lasso_kws)
 
@@ -3,7 +3,6 @@ Various utility functions for validation and computing reconstruction scores and
 """
 
 import numpy as np
-from scipy.sparse import lil_matrix
 
 
 def determinant(top_sensors, n_features, basis_matrix):
@@ -26,12 +25,9 @@ def determinant(top_sensors, n_features, basis_matrix):
 
     p = len(top_sensors)  # Number of sensors
     n, r = np.shape(basis_matrix)  # state dimension X Number of modes
-    c = lil_matrix((p, n), dtype=np.int8)
-
-    for i in range(p):
-        c[i, top_sensors[i]] = 1
-    phi = basis_matrix
-    theta = c @ phi
+    # C phi just picks the rows of phi at the sensor locations, so gather them
+    # directly instead of building the selection matrix C
+    theta = np.asarray(basis_matrix)[np.asarray(top_sensors)]
     if p == r:
         M_gamma = theta
     elif p > r:
@@ -58,5 +54,7 @@ def relative_reconstruction_error(data, prediction):
         error_val : Float,
             The relative error calculated.
     """
-    error_val = (np.linalg.norm((data - prediction) / np.linalg.norm(data))) * 100
+    # Scale the norm rather than the residual, which would take another pass and
+    # a temporary the size of data
+    error_val = np.linalg.norm(data - prediction) / np.linalg.norm(data) * 100
     return error_val
@@ -5,7 +5,9 @@ from unittest.mock import Mock
 import numpy as np
 import pytest
 from pytest_lazyfixture import lazy_fixture
+from sklearn.base import clone
 from sklearn.datasets import make_classification
+from sklearn.discriminant_analysis import LinearDiscriminantAnalysis
 from sklearn.exceptions import NotFittedError
 from sklearn.metrics import accuracy_score
 from sklearn.utils.validation import check_is_fitted
@@ -135,6 +137,22 @@ def test_large_threshold(data):
     assert model.n_sensors == 0
 
 
+def test_update_sensors_reuses_magnitude_buffer(data_binary_classification):
+    x, y, l1_penalty = data_binary_classification
+    model = SSPOC(threshold=0.01, l1_penalty=l1_penalty).fit(x, y, quiet=True)
+    magnitudes = np.abs(model.sensor_coef_)
+
+    for threshold in [0.001, 0.1, 1]:
+        model.update_sensors(threshold=threshold, quiet=True)
+        np.testing.assert_array_equal(
+            model.selected_sensors, np.nonzero(magnitudes >= threshold)[0]
+        )
+    buf = model._abs_buf
+    model.update_sensors(n_sensors=5, quiet=True)
+    assert model._abs_buf is buf
+    np.testing.assert_array_equal(model.selected_sensors, np.argsort(-magnitudes)[:5])
+
+
 def test_bad_update_sensors_input(data_binary_classification):
     x, y, _ = data_binary_classification
     model = SSPOC().fit(x, y, quiet=True)
@@ -444,3 +462,120 @@ def test_uninformative_sensors_multiclass_warning():
         match="Some uninformative sensors were selected. Consider decreasing n_sensors",
     ):
         model.update_sensors(n_sensors=n_sensors_to_select, method=np.mean)
+
+
+@pytest.mark.parametrize("lda_solver", ["svd", "lsqr", "eigen"])
+def test_lda_solver(data_multiclass_classification, lda_solver):
+    x, y, l1_penalty = data_multiclass_classification
+    model = SSPOC(
+        basis=SVD(n_basis_modes=10), l1_penalty=l1_penalty, lda_solver=lda_solver
+    )
+    model.fit(x, y, quiet=True)
+    assert model.classifier_.solver == lda_solver
+    assert model.sensor_coef_.shape == (x.shape[1], len(np.unique(y)))
+    assert len(model.predict(x[:, model.selected_sensors])) == len(y)
+
+
+def test_lda_solver_ignored_with_classifier(data_binary_classification):
+    x, y, _ = data_binary_classification
+    classifier = LinearDiscriminantAnalysis(solver="lsqr")
+    model = SSPOC(classifier=classifier, lda_solver="eigen")
+    assert model.classifier is classifier
+    model.fit(x, y, quiet=True)
+    assert model.classifier_ is classifier
+    assert classifier.solver == "lsqr"
+
+
+def test_lda_solver_respected_by_set_params_and_clone(data_multiclass_classification):
+    x, y, l1_penalty = data_multiclass_classification
+    model = SSPOC(basis=SVD(n_basis_modes=10), l1_penalty=l1_penalty)
+    assert model.get_params()["classifier"] is None
+
+    model.set_params(lda_solver="lsqr").fit(x, y, quiet=True)
+    assert model.classifier_.solver == "lsqr"
+    # Refitting after changing the parameter builds a new classifier
+    model.set_params(lda_solver="eigen").fit(x, y, quiet=True)
+    assert model.classifier_.solver == "eigen"
+
+    cloned = clone(model).fit(x, y, quiet=True)
+    assert cloned.lda_solver == "eigen"
+    assert cloned.classifier_.solver == "eigen"
+
+
+def test_identity_basis_skips_projection(data_binary_classification):
+    x, y, _ = data_binary_classification
+    model = SSPOC(n_sensors=5).fit(x, y, quiet=True, refit=False)
+    assert model._project(x) is x
+    np.testing.assert_array_equal(
+        model.predict(x),
+        model.classifier_.predict(x @ model.basis_matrix_inverse_.T),
+    )
+
+    model = SSPOC(basis=SVD(n_basis_modes=5), n_sensors=5)
+    model.fit(x, y, quiet=True, refit=False)
+    np.testing.assert_allclose(model._project(x), x @ model.basis_matrix_inverse_.T)
+
+
+def test_projector_tracks_basis_matrix_inverse(sspoc_instance):
+    X_test = np.array([[1.0, 2.0, 3.0], [4.0, 5.0, 6.0]])
+    sspoc_instance._project(X_test)
+    projector = sspoc_instance._projector[1]
+    assert projector.flags["C_CONTIGUOUS"]
+    np.testing.assert_array_equal(projector, sspoc_instance.basis_matrix_inverse_.T)
+
+    sspoc_instance.basis_matrix_inverse_ = np.eye(3)
+    np.testing.assert_array_equal(sspoc_instance._project(X_test), X_test)
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        lazy_fixture("data_binary_classification"),
+        lazy_fixture("data_multiclass_classification"),
+    ],
+)
+def test_classifier_without_classes_attribute(data):
+    x, y, l1_penalty = data
+
+    class Classifier:
+        """Linear classifier exposing only fit, predict and coef_."""
+
+        def __init__(self):
+            self._lda = LinearDiscriminantAnalysis()
+
+        def fit(self, x, y):
+            self._lda.fit(x, y)
+            self.coef_ = self._lda.coef_
+            return self
+
+        def predict(self, x):
+            return self._lda.predict(x)
+
+    reference = SSPOC(l1_penalty=l1_penalty, n_sensors=5).fit(x, y, quiet=True)
+    model = SSPOC(classifier=Classifier(), l1_penalty=l1_penalty, n_sensors=5)
+    model.fit(x, y, quiet=True)
+    np.testing.assert_array_equal(model.sensor_coef_, reference.sensor_coef_)
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        lazy_fixture("data_binary_classification"),
+        lazy_fixture("data_multiclass_classification"),
+    ],
+)
+def test_class_metadata(data):
+    x, y, l1_penalty = data
+    model = SSPOC(l1_penalty=l1_penalty).fit(x, y, quiet=True)
+    np.testing.assert_array_equal(model.classes_, np.unique(y))
+    assert model.n_classes_ == len(np.unique(y))
+
+
+@pytest.mark.parametrize("basis", [Identity(), SVD(n_basis_modes=5)])
+def test_dtype(basis, data_multiclass_classification):
+    x, y, l1_penalty = data_multiclass_classification
+    model = SSPOC(basis=basis, l1_penalty=l1_penalty, dtype=np.float32)
+    model.fit(x, y, quiet=True, refit=False)
+    assert model.basis_matrix_inverse_.dtype == np.float32
+    assert model._project(x).dtype == np.float32
+    assert len(model.predict(x)) == len(y)
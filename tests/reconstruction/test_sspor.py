@@ -13,6 +13,7 @@ To run tests for just one file, run
 pytest file_to_test.py
 """
 
+import tracemalloc
 import warnings
 from unittest.mock import Mock, patch
 
@@ -20,13 +21,19 @@ import numpy as np
 import pytest
 from numpy import isnan, mean, nan, sqrt, zeros
 from pytest_lazyfixture import lazy_fixture
+from scipy.linalg import cho_solve, lstsq
 from sklearn.base import BaseEstimator
 from sklearn.exceptions import NotFittedError
 from sklearn.utils.validation import check_is_fitted
 
 from pysensors.basis import SVD, Identity, RandomProjection
-from pysensors.optimizers import CCQR, TPGR
+from pysensors.optimizers import CCQR, QR, TPGR
 from pysensors.reconstruction import SSPOR
+from pysensors.reconstruction._sspor import (
+    FACTORIZATION_CACHE_SIZE,
+    SMALL_SYSTEM_SIZE,
+    _limit_blas_threads,
+)
 
 
 def test_not_fitted(data_vandermonde):
@@ -198,6 +205,22 @@ def test_score(data_vandermonde):
     assert weak_model.score(data) < strong_model.score(data)
 
 
+@pytest.mark.parametrize("n_sensors", [5, 15])
+@pytest.mark.parametrize("chunk_size", [7, 4096])
+def test_score_values(data_random, n_sensors, chunk_size):
+    model = SSPOR(basis=SVD(n_basis_modes=10), n_sensors=n_sensors)
+    model.fit(data_random)
+    sensors = model.get_selected_sensors()
+    y_pred = model.predict(data_random[:, sensors], method="unregularized")
+    expected = -np.sqrt(np.mean((y_pred - data_random) ** 2))
+
+    with patch("pysensors.reconstruction._sspor.RESIDUAL_CHUNK_SIZE", chunk_size):
+        np.testing.assert_allclose(model.score(data_random), expected)
+        np.testing.assert_allclose(
+            model.score(data_random, solve_kws={"check_finite": True}), expected
+        )
+
+
 def test_prefit_basis(data_random):
     data = data_random
     basis = Identity()
@@ -838,6 +861,19 @@ def test_one_pt_landscape():
         assert not np.any(np.isinf(landscape))
 
 
+def test_one_pt_landscape_values():
+    X = np.random.rand(5, 10)
+    model = SSPOR(basis=SVD(n_basis_modes=3), optimizer=TPGR(n_sensors=3))
+    model.fit(x=X)
+    prior = np.array([3.0, 2.0, 1.0])
+
+    G = model.basis_matrix_ @ np.diag(prior)
+    expected = -np.log(1 + np.einsum("ij,ij->i", G, G) / 0.1**2)
+    np.testing.assert_allclose(
+        model.one_pt_energy_landscape(prior=prior, noise=0.1), expected
+    )
+
+
 def test_two_pt_landscape_single_sensor():
     X = np.random.rand(5, 10)
     model = SSPOR(basis=SVD(n_basis_modes=3), optimizer=TPGR(n_sensors=3))
@@ -863,6 +899,42 @@ def test_two_pt_landscape_single_sensor():
         assert not np.any(np.isnan(landscape[remaining_mask]))
 
 
+@pytest.mark.parametrize("selected_sensors", [[3], [1, 5, 8]])
+def test_two_pt_landscape_values(selected_sensors):
+    X = np.random.rand(5, 10)
+    model = SSPOR(basis=SVD(n_basis_modes=3), optimizer=TPGR(n_sensors=3))
+    model.fit(x=X)
+    prior = np.array([3.0, 2.0, 1.0])
+    noise = 0.1
+
+    G = model.basis_matrix_ @ np.diag(prior)
+    mask = np.ones(G.shape[0], dtype=bool)
+    mask[selected_sensors] = False
+    G_selected = G[selected_sensors, :]
+    G_remaining = G[mask, :]
+    expected = np.full(G.shape[0], np.nan)
+    expected[mask] = 0.5 * np.sum(
+        (G_remaining @ G_selected.T) ** 2
+        / (
+            np.outer(
+                1 + np.sum(G_remaining**2, axis=1) / noise**2,
+                1 + np.sum(G_selected**2, axis=1) / noise**2,
+            )
+            * noise**4
+        ),
+        axis=1,
+    )
+    np.testing.assert_allclose(
+        model.two_pt_energy_landscape(selected_sensors, prior=prior, noise=noise),
+        expected,
+    )
+    with patch("pysensors.reconstruction._sspor.RESIDUAL_CHUNK_SIZE", 3):
+        np.testing.assert_allclose(
+            model.two_pt_energy_landscape(selected_sensors, prior=prior, noise=noise),
+            expected,
+        )
+
+
 def test_two_pt_landscape_multiple_sensors():
     X = np.random.rand(5, 10)
     model = SSPOR(basis=SVD(n_basis_modes=3), optimizer=TPGR(n_sensors=3))
@@ -961,3 +1033,424 @@ def test_landscapes_invalid_prior():
         model.two_pt_energy_landscape(
             selected_sensors=selected_sensors, prior=wrong_shape_prior, noise=0.1
         )
+
+
+@pytest.mark.parametrize("n_sensors", [3, 5, 8])
+def test_unregularized_predict_matches_lstsq(n_sensors):
+    x = np.random.randn(40, 20)
+    model = SSPOR(basis=SVD(n_basis_modes=5), n_sensors=n_sensors)
+    model.fit(x)
+    sensors = model.get_selected_sensors()
+    x_test = np.random.randn(4, 20)
+
+    basis = model.basis_matrix_
+    expected = (basis @ lstsq(basis[sensors, :], x_test[:, sensors].T)[0]).T
+    np.testing.assert_allclose(
+        model.predict(x_test[:, sensors], method="unregularized"), expected
+    )
+    np.testing.assert_allclose(
+        model.predict(x_test[0, sensors], method="unregularized"), expected[0]
+    )
+
+
+def test_unregularized_predict_reuses_factorization(data_random):
+    model = SSPOR(n_sensors=5)
+    model.fit(data_random)
+    sensors = model.get_selected_sensors()
+
+    model.predict(data_random[:, sensors], method="unregularized")
+    (factorization,) = model._factorizations[1].values()
+    model.predict(data_random[:2, sensors], method="unregularized")
+    assert len(model._factorizations[1]) == 1
+
+    # Switching between sensor sets reuses the earlier factorizations
+    model.set_number_of_sensors(6)
+    sensors_6 = model.get_selected_sensors()
+    model.predict(data_random[:, sensors_6], method="unregularized")
+    assert len(model._factorizations[1]) == 2
+    model.set_number_of_sensors(5)
+    model.predict(data_random[:, sensors], method="unregularized")
+    assert len(model._factorizations[1]) == 2
+    assert model._get_factorization(sensors) is factorization
+
+    # Refitting invalidates the factorizations
+    model.fit(data_random)
+    assert model._factorizations is None
+
+
+def test_rectangular_predict_solve_kws_driver(data_random):
+    model = SSPOR(n_sensors=15)
+    model.fit(data_random)
+    sensors = model.get_selected_sensors()
+    x = data_random[:, sensors]
+
+    with patch("pysensors.reconstruction._sspor.lstsq", wraps=lstsq) as mock:
+        y = model.predict(x, method="unregularized", check_finite=True)
+        assert mock.call_args.kwargs["lapack_driver"] == "gelsy"
+        np.testing.assert_allclose(
+            y, model.predict(x, method="unregularized"), atol=1e-8
+        )
+
+        # User-supplied drivers take precedence
+        model.predict(x, method="unregularized", lapack_driver="gelsd")
+        assert mock.call_args.kwargs["lapack_driver"] == "gelsd"
+
+
+@pytest.mark.parametrize("basis", [Identity(), SVD(n_basis_modes=5)])
+def test_singular_values(data_random, basis):
+    model = SSPOR(basis=basis)
+    model.fit(data_random)
+    expected = np.linalg.norm(data_random @ model.basis_matrix_, axis=0) / sqrt(
+        data_random.shape[0]
+    )
+    np.testing.assert_allclose(model.singular_values, expected)
+
+    with patch("pysensors.reconstruction._sspor.PROJECTION_CHUNK_SIZE", 3):
+        model.fit(data_random, prefit_basis=True)
+    np.testing.assert_allclose(model.singular_values, expected)
+
+
+def test_tail_sensors_shuffle_is_seeded(data_random):
+    model = SSPOR(basis=SVD(n_basis_modes=5))
+    model.fit(data_random, seed=3)
+    sensors = model.get_all_sensors()
+
+    # The leading sensors are the optimizer's; the rest are a seeded shuffle
+    ranked = QR().fit(model.basis_matrix_).get_sensors()
+    np.testing.assert_array_equal(sensors[:5], ranked[:5])
+    expected = np.random.default_rng(3).permutation(ranked[5:])
+    np.testing.assert_array_equal(sensors[5:], expected)
+
+
+def test_factorization_cache_is_bounded(data_random):
+    model = SSPOR()
+    model.fit(data_random)
+    for n_sensors in range(1, FACTORIZATION_CACHE_SIZE + 3):
+        model.set_number_of_sensors(n_sensors)
+        sensors = model.get_selected_sensors()
+        model.predict(data_random[:, sensors], method="unregularized")
+    cache = model._factorizations[1]
+    assert len(cache) == FACTORIZATION_CACHE_SIZE
+    # The oldest sensor sets were evicted first
+    assert model.get_all_sensors()[:1].tobytes() not in cache
+    assert sensors.tobytes() in cache
+
+
+@pytest.mark.parametrize(
+    "method, args",
+    [
+        ("predict", lambda x: (x[:, :5],)),
+        ("predict_batch", lambda x: ([x[:2, :5], x[2:, :5]],)),
+        ("reconstruction_error", lambda x: (x,)),
+        ("std", lambda x: (np.ones(5), 0.1)),
+        ("score", lambda x: (x,)),
+    ],
+)
+def test_checks_fitted_once(data_random, method, args):
+    model = SSPOR(basis=SVD(n_basis_modes=5), n_sensors=5).fit(data_random)
+    model.ranked_sensors_ = np.arange(data_random.shape[1])
+    with patch(
+        "pysensors.reconstruction._sspor.check_is_fitted", wraps=check_is_fitted
+    ) as mock:
+        getattr(model, method)(*args(data_random))
+    assert mock.call_count == 1
+
+
+@pytest.mark.parametrize("method", [None, "unregularized"])
+def test_predict_batch(data_random, method):
+    model = SSPOR(basis=SVD(n_basis_modes=5), n_sensors=8)
+    model.fit(data_random)
+    sensors = model.get_selected_sensors()
+    xs = [data_random[:3, sensors], data_random[3, sensors], data_random[4:9, sensors]]
+
+    ys = model.predict_batch(xs, method=method, noise=0.1)
+    assert len(ys) == len(xs)
+    for x, y in zip(xs, ys):
+        np.testing.assert_allclose(y, model.predict(x, method=method, noise=0.1))
+    assert ys[1].shape == (data_random.shape[1],)
+    assert model.predict_batch([]) == []
+
+    with pytest.raises(ValueError):
+        model.predict_batch([data_random])
+    with pytest.raises(ValueError, match="numpy array"):
+        model.predict_batch([data_random[3, sensors].tolist()])
+
+
+@pytest.mark.parametrize(
+    "shape, rank", [((10, 4), 4), ((10, 4), 2), ((4, 4), 3), ((3, 6), 3), ((3, 6), 2)]
+)
+def test_unregularized_predict_rank_deficient(shape, rank):
+    n_sensors, n_basis_modes = shape
+    rng = np.random.default_rng(0)
+    model = SSPOR(n_sensors=n_sensors)
+    model.basis_matrix_ = rng.standard_normal((12, rank)) @ rng.standard_normal(
+        (rank, n_basis_modes)
+    )
+    model.ranked_sensors_ = np.arange(12)
+    sensors = model.ranked_sensors_[:n_sensors]
+    x = rng.standard_normal((5, n_sensors))
+
+    # Minimum norm least squares solution, as computed by lstsq
+    basis = model.basis_matrix_
+    expected = (basis @ lstsq(basis[sensors, :], x.T)[0]).T
+    np.testing.assert_allclose(
+        model.predict(x, method="unregularized"), expected, atol=1e-10
+    )
+
+
+@pytest.mark.parametrize("solve_kws", [{}, {"check_finite": True}])
+@pytest.mark.parametrize("n_sensors", [3, 5, 8])
+def test_unregularized_predict_does_not_modify_inputs(n_sensors, solve_kws):
+    x = np.random.randn(40, 20)
+    model = SSPOR(basis=SVD(n_basis_modes=5), n_sensors=n_sensors).fit(x)
+    basis = model.basis_matrix_.copy()
+    x_sensors = x[:, model.get_selected_sensors()]
+    x_copy = x_sensors.copy()
+
+    model.predict(x_sensors, method="unregularized", **solve_kws)
+    np.testing.assert_array_equal(x_sensors, x_copy)
+    np.testing.assert_array_equal(model.basis_matrix_, basis)
+
+
+@pytest.mark.parametrize("method", [None, "unregularized"])
+def test_dtype(data_random, method):
+    model = SSPOR(basis=SVD(n_basis_modes=5), n_sensors=8, dtype=np.float32)
+    model.fit(data_random)
+    assert model.basis_matrix_.dtype == np.float32
+    assert model.singular_values.dtype == np.float32
+
+    sensors = model.get_selected_sensors()
+    x_pred = model.predict(data_random[:, sensors], method=method, noise=0.1)
+    assert x_pred.dtype == np.float32
+
+    # Same model, computed in double precision
+    reference = SSPOR(n_sensors=8)
+    reference.basis_matrix_ = model.basis_matrix_.astype(np.float64)
+    reference.ranked_sensors_ = model.ranked_sensors_
+    reference.singular_values = model.singular_values.astype(np.float64)
+    np.testing.assert_allclose(
+        x_pred,
+        reference.predict(data_random[:, sensors], method=method, noise=0.1),
+        rtol=1e-3,
+        atol=1e-3,
+    )
+
+
+@pytest.mark.parametrize("order", ["C", "F"])
+def test_regularized_rhs_fortran_ordered(data_random, order):
+    model = SSPOR(basis=SVD(n_basis_modes=5), n_sensors=8).fit(data_random)
+    sensors = model.get_selected_sensors()
+    x = np.asarray(data_random[:, sensors], order=order)
+    expected = model.predict(x, noise=0.1)
+
+    with patch("pysensors.reconstruction._sspor.cho_solve", wraps=cho_solve) as mock:
+        np.testing.assert_allclose(model.predict(x, noise=0.1), expected)
+    assert mock.call_args.args[1].flags["F_CONTIGUOUS"]
+
+
+@pytest.mark.parametrize("method", [None, "unregularized"])
+@pytest.mark.parametrize("n_sensors", [3, 5, 8])
+def test_predict_out(data_random, method, n_sensors):
+    model = SSPOR(basis=SVD(n_basis_modes=5), n_sensors=n_sensors).fit(data_random)
+    x = data_random[:4, model.get_selected_sensors()]
+    expected = model.predict(x, method=method, noise=0.1)
+
+    out = np.empty((4, data_random.shape[1]))
+    assert model.predict(x, method=method, noise=0.1, out=out) is out
+    np.testing.assert_allclose(out, expected)
+
+    with pytest.raises(ValueError):
+        model.predict(x, method=method, noise=0.1, out=np.empty((3, 3)))
+
+
+def test_selected_basis_is_cached(data_random):
+    model = SSPOR(basis=SVD(n_basis_modes=5), n_sensors=8).fit(data_random)
+    sensors = model.get_selected_sensors()
+    model.predict(data_random[:, sensors], noise=0.1)
+    selection = model._basis_selection[2]
+    assert selection.flags["F_CONTIGUOUS"]
+    np.testing.assert_array_equal(selection, model.basis_matrix_[sensors, :])
+    np.testing.assert_allclose(
+        np.tril(model._basis_selection[3]), np.tril(selection.T @ selection)
+    )
+
+    model.std(prior="decreasing", noise=0.1)
+    assert model._basis_selection[2] is selection
+
+    model.set_number_of_sensors(6)
+    model.std(prior="decreasing", noise=0.1)
+    np.testing.assert_array_equal(
+        model._basis_selection[2], model.basis_matrix_[sensors[:6], :]
+    )
+    model.fit(data_random)
+    assert model._basis_selection is None
+
+
+def test_predict_without_validation(data_random):
+    model = SSPOR(n_sensors=5).fit(data_random)
+    x = data_random[:, model.get_selected_sensors()]
+    expected = model.predict(x, method="unregularized")
+
+    with patch("pysensors.reconstruction._sspor.validate_input") as mock_validate:
+        x_pred = model.predict(x, method="unregularized", validate=False)
+    mock_validate.assert_not_called()
+    np.testing.assert_allclose(x_pred, expected)
+
+
+@pytest.mark.parametrize("basis", [Identity(), SVD(n_basis_modes=5)])
+def test_basis_matrix_fortran_ordered(data_random, basis):
+    model = SSPOR(basis=basis).fit(data_random)
+    assert model.basis_matrix_.flags["F_CONTIGUOUS"]
+    np.testing.assert_array_equal(
+        model.basis_matrix_, model.basis.matrix_representation()
+    )
+
+
+def test_limit_blas_threads():
+    threadpoolctl = pytest.importorskip("threadpoolctl", minversion="3.0")
+
+    def blas_threads():
+        return [
+            info["num_threads"]
+            for info in threadpoolctl.threadpool_info()
+            if info["user_api"] == "blas"
+        ]
+
+    before = blas_threads()
+    with _limit_blas_threads(SMALL_SYSTEM_SIZE - 1):
+        assert all(n == 1 for n in blas_threads())
+    assert blas_threads() == before
+    with _limit_blas_threads(SMALL_SYSTEM_SIZE):
+        assert blas_threads() == before
+
+
+@pytest.mark.parametrize("order", ["C", "F"])
+def test_basis_rows(data_random, order):
+    model = SSPOR(basis=SVD(n_basis_modes=5)).fit(data_random)
+    sensors = model.get_all_sensors()[:8]
+    rows = model._basis_rows(sensors, order=order)
+    assert rows.flags[order + "_CONTIGUOUS"]
+    np.testing.assert_array_equal(rows, model.basis_matrix_[sensors, :])
+    assert not np.shares_memory(rows, model.basis_matrix_)
+
+
+@pytest.mark.parametrize("n_sensors", [2, 5, 8])
+def test_regularized_reconstruction_and_std_values(n_sensors):
+    X = np.random.rand(20, 10)
+    model = SSPOR(basis=SVD(n_basis_modes=4), n_sensors=n_sensors).fit(X)
+    prior = np.linspace(2, 0.5, 4)
+    noise = 0.1
+
+    # Direct evaluation of the formulas in Klishin et al. (2023)
+    basis = model.basis_matrix_
+    selection = basis[model.get_selected_sensors(), :]
+    composite = np.diag(1 / prior**2) + selection.T @ selection / noise**2
+    x_sensors = X[:, model.get_selected_sensors()]
+    expected_pred = (
+        basis @ np.linalg.inv(composite) @ selection.T @ x_sensors.T / noise**2
+    ).T
+    expected_std = noise * np.linalg.norm(
+        basis @ np.linalg.inv(composite) @ selection.T / noise**2, axis=1
+    )
+
+    np.testing.assert_allclose(
+        model.predict(x_sensors, prior=prior, noise=noise), expected_pred
+    )
+    np.testing.assert_allclose(model.std(prior=prior, noise=noise), expected_std)
+    with patch("pysensors.reconstruction._sspor.RESIDUAL_CHUNK_SIZE", 3):
+        np.testing.assert_allclose(model.std(prior=prior, noise=noise), expected_std)
+
+
+def _reference_reconstruction_error(model, x_test, sensor_range):
+    basis = model.basis_matrix_
+    errors = []
+    for n_sensors in sensor_range:
+        sensors = model.ranked_sensors_[:n_sensors]
+        coef = lstsq(basis[sensors, :], x_test[:, sensors].T)[0]
+        errors.append(np.sqrt(np.mean((basis @ coef - x_test.T) ** 2)))
+    return np.array(errors)
+
+
+@pytest.mark.parametrize("sensor_range", [None, [1, 2, 3], [8, 3, 5, 12, 1]])
+def test_reconstruction_error_values(data_random, sensor_range):
+    model = SSPOR(basis=SVD(n_basis_modes=5), n_sensors=12).fit(data_random)
+    x_test = np.random.randn(7, data_random.shape[1])
+    error = model.reconstruction_error(x_test, sensor_range=sensor_range)
+    if sensor_range is None:
+        sensor_range = np.arange(1, 13)
+    np.testing.assert_allclose(
+        error, _reference_reconstruction_error(model, x_test, sensor_range)
+    )
+    np.testing.assert_allclose(
+        error,
+        model.reconstruction_error(
+            x_test, sensor_range=sensor_range, check_finite=True
+        ),
+    )
+
+
+def test_reconstruction_error_rank_deficient_prefix():
+    rng = np.random.default_rng(1)
+    model = SSPOR(n_sensors=6)
+    model.basis_matrix_ = rng.standard_normal((6, 4))
+    # The third ranked sensor duplicates the first one
+    model.basis_matrix_[2] = model.basis_matrix_[0]
+    model.ranked_sensors_ = np.arange(6)
+    x_test = rng.standard_normal((3, 6))
+    sensor_range = np.arange(1, 7)
+
+    np.testing.assert_allclose(
+        model.reconstruction_error(x_test, sensor_range=sensor_range),
+        _reference_reconstruction_error(model, x_test, sensor_range),
+    )
+
+
+@pytest.mark.parametrize(
+    "basis, orthonormal", [(SVD(n_basis_modes=5), True), (Identity(), False)]
+)
+def test_reconstruction_error_orthonormal_basis(data_random, basis, orthonormal):
+    model = SSPOR(basis=basis, n_sensors=12).fit(data_random)
+    assert model._has_orthonormal_basis() == orthonormal
+
+    x_test = np.random.randn(7, data_random.shape[1])
+    sensor_range = [1, 4, 12]
+    expected = _reference_reconstruction_error(model, x_test, sensor_range)
+    np.testing.assert_allclose(
+        model.reconstruction_error(x_test, sensor_range=sensor_range), expected
+    )
+    # Single examples reduce to the same errors as one-row batches
+    np.testing.assert_allclose(
+        model.reconstruction_error(x_test[0], sensor_range=sensor_range),
+        _reference_reconstruction_error(model, x_test[:1], sensor_range),
+    )
+    with patch("pysensors.reconstruction._sspor.RESIDUAL_CHUNK_SIZE", 4):
+        np.testing.assert_allclose(
+            model.reconstruction_error(x_test, sensor_range=sensor_range), expected
+        )
+
+
+def test_reconstruction_error_bounds_memory_for_large_sensor_range():
+    rng = np.random.default_rng(0)
+    model = SSPOR(basis=Identity()).fit(rng.standard_normal((40, 300)))
+    x_test = rng.standard_normal((100, 300))
+    sensor_range = np.arange(1, 301)
+    n_basis_modes = model.basis_matrix_.shape[1]
+    # Bytes needed to hold the coefficients for every number of sensors at once
+    stacked_bytes = n_basis_modes * len(x_test) * len(sensor_range) * 8
+    expected = model.reconstruction_error(
+        x_test,
+        sensor_range=sensor_range,
+        score=lambda x, y: np.sqrt(np.mean((x - y) ** 2)),
+    )
+
+    # Room for the coefficients of two numbers of sensors at a time
+    budget = 2 * n_basis_modes * len(x_test)
+    with patch("pysensors.reconstruction._sspor.COEFFICIENT_STACK_SIZE", budget):
+        tracemalloc.start()
+        try:
+            error = model.reconstruction_error(x_test, sensor_range=sensor_range)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    np.testing.assert_allclose(error, expected)
+    assert peak < stacked_bytes / 4
@@ -1,7 +1,17 @@
+import warnings
+
 import numpy as np
 import pytest
+from sklearn.exceptions import NotFittedError
 
-from pysensors.utils import validate_input  # Adjust import path as needed
+from pysensors.basis import SVD
+from pysensors.classification import SSPOC
+from pysensors.reconstruction import SSPOR
+from pysensors.utils import (
+    as_dtype,
+    fit_basis,
+    validate_input,
+)  # Adjust import path as needed
 
 
 def test_validate_input_value_errors():
@@ -37,3 +47,51 @@ def test_validate_input_valid_cases():
 
     result = validate_input(x_2d, None)
     assert np.array_equal(result, x_2d)
+
+
+def test_fit_basis():
+    x = np.random.randn(20, 10)
+    basis = SVD(n_basis_modes=3)
+    with pytest.raises(NotFittedError):
+        fit_basis(basis, x, prefit_basis=True)
+    with pytest.raises(ValueError, match="x must be a numpy array"):
+        fit_basis(basis, x.tolist())
+
+    assert fit_basis(basis, x) is x
+    assert basis.basis_matrix_.shape == (10, 3)
+
+
+def test_fit_basis_quiet():
+    class WarningBasis(SVD):
+        def fit(self, x):
+            warnings.warn("basis warning", UserWarning)
+            return super().fit(x)
+
+    x = np.random.randn(20, 10)
+    with pytest.warns(UserWarning, match="basis warning"):
+        fit_basis(WarningBasis(n_basis_modes=3), x)
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        fit_basis(WarningBasis(n_basis_modes=3), x, quiet=True)
+
+
+def test_fit_basis_shared_between_models():
+    x = np.random.randn(30, 10)
+    y = np.arange(30) % 2
+    basis = SVD(n_basis_modes=4)
+    fit_basis(basis, x)
+    basis_matrix = basis.basis_matrix_
+
+    SSPOR(basis=basis).fit(x, prefit_basis=True)
+    SSPOC(basis=basis).fit(x, y, prefit_basis=True, quiet=True)
+    assert basis.basis_matrix_ is basis_matrix
+
+
+def test_as_dtype():
+    x = np.arange(6, dtype=np.float64).reshape(2, 3)
+    assert as_dtype(x) is x
+    assert as_dtype(x, np.float64) is x
+    x32 = as_dtype(x, np.float32)
+    assert x32.dtype == np.float32
+    np.testing.assert_array_equal(x32, x)
+    assert as_dtype([1.0, 2.0], np.float32) == [1.0, 2.0]
@@ -1,4 +1,6 @@
 import os.path
+import sys
+from contextlib import ExitStack
 from unittest.mock import ANY, MagicMock, patch
 
 import matplotlib.patches as patches
@@ -16,6 +18,7 @@ from pysensors.utils._constraints import (
     Parabola,
     Polygon,
     UserDefinedConstraints,
+    constraint_matrix,
     get_constrained_sensors_indices,
     get_constrained_sensors_indices_dataframe,
     get_constrained_sensors_indices_distance,
@@ -240,6 +243,16 @@ def test_order_constrained_sensors():
     ), "Ordering test failed for ranks"
 
 
+def test_order_constrained_sensors_with_tied_ranks():
+    idx_constrained_list = [7, 3, 9, 1]
+    ranks_list = [2, 1, 2, 1]
+    sortedConstraints, ranks = order_constrained_sensors(
+        idx_constrained_list, ranks_list
+    )
+    np.testing.assert_array_equal(sortedConstraints, [3, 1, 7, 9])
+    np.testing.assert_array_equal(ranks, [1, 1, 2, 2])
+
+
 def test_order_constrained_sensors_with_reversed_ranks():
     idx_constrained_list = np.array([1, 2, 3, 4, 5])
     ranks_list = np.array([5, 4, 3, 2, 1])
@@ -356,6 +369,82 @@ def test_get_constrained_sensors_indices_last_block():
     assert np.array_equal(result, np.array([56]))
 
 
+@pytest.mark.parametrize(
+    "x_min, x_max, y_min, y_max",
+    [(2, 7, 4, 10), (1.5, 7.2, -3, 4.9), (-5, -1, 0, 3), (20, 30, 0, 5)],
+)
+@pytest.mark.parametrize("n_sensors", [144, 10])
+def test_get_constrained_sensors_indices_matches_loop(
+    x_min, x_max, y_min, y_max, n_sensors
+):
+    nx, ny = 12, 12
+    all_sensors = np.random.default_rng(0).permutation(nx * ny)[:n_sensors]
+
+    rows, cols = np.unravel_index(all_sensors, (nx, ny))
+    expected = [
+        np.ravel_multi_index((c, r), (nx, ny))
+        for r, c in zip(rows, cols)
+        if x_min <= r <= x_max and y_min <= c <= y_max
+    ]
+    result = get_constrained_sensors_indices(
+        x_min, x_max, y_min, y_max, nx, ny, all_sensors
+    )
+    np.testing.assert_array_equal(result, expected)
+
+
+@pytest.mark.parametrize("loc", ["in", "out"])
+@pytest.mark.parametrize(
+    "shape, kwargs",
+    [
+        (Circle, dict(center_x=4, center_y=5, radius=3)),
+        (Parabola, dict(h=5, k=2, a=0.5)),
+        (Ellipse, dict(center_x=5, center_y=4, width=6, height=3, angle=30)),
+        (Polygon, dict(xy_coords=[(1, 1), (8, 2), (6, 9), (2, 6)])),
+        (Line, dict(x1=0, x2=10, y1=2, y2=8)),
+    ],
+)
+def test_constraint_mask_matches_constraint_function(shape, kwargs, loc):
+    data = np.random.rand(3, 144)
+    if shape is not Line:
+        kwargs = dict(kwargs, loc=loc)
+    constraint = shape(data=data, **kwargs)
+    all_sensors = np.random.default_rng(0).permutation(144)
+    coords = np.array(get_coordinates_from_indices(all_sensors, data), dtype=float)
+
+    expected = [constraint.constraint_function(coords[:, i]) for i in range(144)]
+    np.testing.assert_array_equal(constraint._constraint_mask(coords), expected)
+    idx_const, rank = constraint.get_constraint_indices(all_sensors, data)
+    np.testing.assert_array_equal(idx_const, all_sensors[~np.array(expected)])
+
+
+def test_constraint_matrix_matches_constraint_masks():
+    data = np.random.rand(3, 144)
+    constraints = [
+        Circle(center_x=4, center_y=5, radius=3, loc="in", data=data),
+        Line(x1=0, x2=11, y1=2, y2=9, data=data),
+        Circle(center_x=8, center_y=2, radius=2.5, loc="out", data=data),
+        Parabola(h=6, k=3, a=0.5, loc="in", data=data),
+        Ellipse(center_x=5, center_y=4, width=6, height=3, angle=30, data=data),
+        Polygon(xy_coords=[(1, 1), (8, 2), (6, 9), (2, 6)], data=data),
+        Line(x1=3, x2=4, y1=0, y2=11, data=data),
+        Parabola(h=2, k=8, a=-1, loc="out", data=data),
+        Ellipse(center_x=7, center_y=7, width=4, height=8, loc="out", data=data),
+    ]
+    coords = np.array(get_coordinates_from_indices(np.arange(144), data), dtype=float)
+
+    # The analytic shapes must not fall back to their own masks
+    with ExitStack() as stack:
+        for kind in (Circle, Line, Parabola, Ellipse):
+            stack.enter_context(
+                patch.object(kind, "_constraint_mask", side_effect=AssertionError)
+            )
+        G = constraint_matrix(constraints, coords)
+    assert G.shape == (len(constraints), 144)
+    assert G.dtype == bool
+    for g, constraint in zip(G, constraints):
+        np.testing.assert_array_equal(g, constraint._constraint_mask(coords))
+
+
 def test_get_constrained_sensors_indices_dataframe_exceptions():
     """Test that the function raises exceptions when required kwargs are missing."""
     df = pd.DataFrame({"x": [1, 2, 3, 4, 5], "y": [5, 4, 3, 2, 1]})
@@ -378,6 +467,33 @@ def test_get_constrained_sensors_indices_dataframe_exceptions():
         pytest.fail(f"Function raised an exception unexpectedly: {e}")
 
 
+@pytest.mark.parametrize("index", [None, [4, 2, 0, 1, 3]])
+def test_get_coordinates_from_indices_dataframe_matches_loc(index):
+    df = pd.DataFrame(
+        {"x": [1.0, 2.0, 3.0, 4.0, 5.0], "y": [5.0, 4.0, 3.0, 2.0, 1.0]}, index=index
+    )
+    idx = np.array([3, 0, 2])
+    x, y = get_coordinates_from_indices(idx, df, X_axis="x", Y_axis="y")
+    np.testing.assert_array_equal(x, df.loc[idx, "x"].values)
+    np.testing.assert_array_equal(y, df.loc[idx, "y"].values)
+    with pytest.raises(Exception, match="Sensor ID must be within dataframe entries"):
+        get_coordinates_from_indices(np.array([0, -1]), df, X_axis="x", Y_axis="y")
+
+
+def test_get_coordinates_from_indices_numpy_returns_writeable_arrays():
+    data = np.random.rand(3, 36)
+    idx = np.random.default_rng(0).permutation(36)
+    x, y = get_coordinates_from_indices(idx, data)
+    expected_x, expected_y = np.unravel_index(idx, (6, 6), "F")
+    np.testing.assert_array_equal(x, expected_x)
+    np.testing.assert_array_equal(y, expected_y)
+
+    # Callers may modify the coordinates without affecting later calls
+    x -= 1
+    x_again, _ = get_coordinates_from_indices(idx, data)
+    np.testing.assert_array_equal(x_again, expected_x)
+
+
 def test_get_coordinates_from_indices_exceptions():
     """Test all possible exceptions raised by get_coordinates_from_indices."""
     df = pd.DataFrame(
@@ -449,6 +565,20 @@ def test_user_function():
     assert func() == 1
 
 
+def test_load_functional_constraints_from_path(tmp_path):
+    # The name ends in characters of ".py", which must not be stripped
+    test_file = tmp_path / "happy.py"
+    test_file.write_text("def happy(x, y):\n    return x - y\n")
+    sys_path = list(sys.path)
+
+    func = load_functional_constraints(str(test_file))
+    assert func.__name__ == "happy"
+    assert func(3, 1) == 2
+    assert sys.path == sys_path
+    # Loading the same file again reuses the loaded function
+    assert load_functional_constraints(str(test_file)) is func
+
+
 def test_get_constrained_sensors_indices_distance_empty_piv():
     """Test that the function handles empty piv array."""
     piv = np.array([])
@@ -1232,6 +1362,28 @@ class TestBaseConstraint:
                 existing_ax, alpha=0.3, cmap=plt.cm.coolwarm, s=1, color="red"
             )
 
+    def test_plot_constraint_on_data_image_reuses_artist(self):
+        """Redrawing an image on the same axes updates the existing artist."""
+        sample_data = np.random.rand(4, 64)
+
+        class MockConstraint(BaseConstraint):
+            def draw(self, ax, **kwargs):
+                pass
+
+        constraint = MockConstraint(data=sample_data)
+        fig, ax = plt.subplots()
+        constraint.plot_constraint_on_data("image", plot=(fig, ax))
+        image = constraint._image
+        constraint.data = sample_data[::-1]
+        constraint.plot_constraint_on_data("image", plot=(fig, ax))
+        assert constraint._image is image
+        assert len(ax.images) == 1
+        np.testing.assert_array_equal(image.get_array(), sample_data[2].reshape(8, 8))
+        _, other_ax = plt.subplots()
+        constraint.plot_constraint_on_data("image", plot=(fig, other_ax))
+        assert constraint._image is not image
+        plt.close("all")
+
     def test_get_functionalConstrained_sensors_indices(self):
         """Test get_functionalConstraind_sensors_indices method."""
         senID = np.array([0, 1, 2, 3, 4])
@@ -1241,6 +1393,11 @@ class TestBaseConstraint:
         )
         np.testing.assert_array_equal(idx_constrained, [1, 3])
         np.testing.assert_array_equal(rank, [0, 1])
+        circle = Circle(center_x=1, center_y=1, radius=1, data=np.zeros((2, 4)))
+        idx_constrained, rank = circle.get_functionalConstraind_sensors_indices(
+            senID, g
+        )
+        np.testing.assert_array_equal(idx_constrained, [1, 3])
 
     def test_get_constraint_indices(self, sample_dataframe):
         """Test get_constraint_indices method."""